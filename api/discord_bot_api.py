@@ -4,13 +4,14 @@ Provides REST API endpoints for Discord bot integration with TF_System
 """
 
 from flask import Blueprint, request, jsonify, current_app
-from database.models import db, Member, RankMapping, PromotionLog, ActivityLog
+from database.models import db, Member, RankMapping, PromotionLog, ActivityLog, strict_load
 from database.ac_models import (
     ACPeriod, ActivityEntry, InactivityNotice, ACExemption,
     ACTIVITY_TYPES, get_activity_points, get_member_quota,
     is_limited_activity
 )
 from utils.api_auth import api_key_required, log_api_access
+from utils.rank_cache import DEFAULT_RANKS, get_active_ranks
 from utils.roblox_sync import sync_member_to_roblox, add_member_to_roblox, remove_member_from_roblox
 from sqlalchemy import or_, func
 from datetime import datetime
@@ -53,6 +54,45 @@ def send_discord_notification(message: str, title: str = "TF System Notification
         return False
 
 
+def _member_details(member: Member) -> dict:
+    """Serialize a member with recent activities and rank history"""
+    recent_activities = ActivityEntry.query.options(*strict_load()) \
+        .filter_by(member_id=member.id) \
+        .order_by(ActivityEntry.activity_date.desc()).limit(10).all()
+    
+    rank_history = PromotionLog.query.filter_by(member_id=member.id) \
+        .order_by(PromotionLog.promotion_date.desc()).limit(5).all()
+    
+    return {
+        'id': member.id,
+        'discord_username': member.discord_username,
+        'roblox_username': member.roblox_username,
+        'roblox_id': member.roblox_id,
+        'current_rank': member.current_rank,
+        'join_date': member.join_date.isoformat() if member.join_date else None,
+        'last_updated': member.last_updated.isoformat() if member.last_updated else None,
+        'recent_activities': [
+            {
+                'type': a.activity_type,
+                'date': a.activity_date.isoformat() if a.activity_date else None,
+                'points': float(a.points) if a.points else 0.0,
+                'description': a.description
+            }
+            for a in recent_activities
+        ],
+        'rank_history': [
+            {
+                'from_rank': p.from_rank,
+                'to_rank': p.to_rank,
+                'date': p.promotion_date.isoformat() if p.promotion_date else None,
+                'promoted_by': p.promoted_by,
+                'reason': p.reason
+            }
+            for p in rank_history
+        ]
+    }
+
+
 # ============================================================================
 # SYSTEM STATUS
 # ============================================================================
@@ -143,14 +183,7 @@ def get_members():
         
         # Apply search filter
         if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Member.discord_username.ilike(search_pattern),
-                    Member.roblox_username.ilike(search_pattern),
-                    Member.current_rank.ilike(search_pattern)
-                )
-            )
+            query = query.filter(Member.search_filter(search))
         
         # Apply rank filter
         if rank_filter:
@@ -213,42 +246,7 @@ def get_member(member_id):
                 'message': f'Member with ID {member_id} not found'
             }), 404
         
-        # Get recent activities
-        recent_activities = ActivityEntry.query.filter_by(member_id=member_id) \
-            .order_by(ActivityEntry.activity_date.desc()).limit(10).all()
-        
-        # Get rank history
-        rank_history = PromotionLog.query.filter_by(member_id=member_id) \
-            .order_by(PromotionLog.promotion_date.desc()).limit(5).all()
-        
-        member_data = {
-            'id': member.id,
-            'discord_username': member.discord_username,
-            'roblox_username': member.roblox_username,
-            'roblox_id': member.roblox_id,
-            'current_rank': member.current_rank,
-            'join_date': member.join_date.isoformat() if member.join_date else None,
-            'last_updated': member.last_updated.isoformat() if member.last_updated else None,
-            'recent_activities': [
-                {
-                    'type': a.activity_type,
-                    'date': a.activity_date.isoformat() if a.activity_date else None,
-                    'points': float(a.points) if a.points else 0.0,
-                    'description': a.description
-                }
-                for a in recent_activities
-            ],
-            'rank_history': [
-                {
-                    'from_rank': p.from_rank,
-                    'to_rank': p.to_rank,
-                    'date': p.promotion_date.isoformat() if p.promotion_date else None,
-                    'promoted_by': p.promoted_by,
-                    'reason': p.reason
-                }
-                for p in rank_history
-            ]
-        }
+        member_data = _member_details(member)
         
         log_api_access(f'/members/{member_id}', 'GET', success=True, response_code=200)
         
@@ -337,6 +335,65 @@ def search_members():
         }), 500
 
 
+@api_bp.route('/members/lookup', methods=['GET'])
+@api_key_required
+def lookup_member():
+    """
+    Find the best match for a name and return its full details in one call
+    
+    Query Parameters:
+        q (str): Discord or Roblox username to look up (required)
+    
+    Returns:
+        200: Member details (same shape as GET /members/<id>)
+        400: Missing query
+        404: No matching member
+    """
+    try:
+        query_str = request.args.get('q', '').strip()
+        
+        if not query_str:
+            return jsonify({
+                'success': False,
+                'error': 'missing_query',
+                'message': 'Search query (q) is required'
+            }), 400
+        
+        search_pattern = f"%{query_str}%"
+        member = Member.query.filter_by(is_active=True).filter(
+            or_(
+                Member.discord_username.ilike(search_pattern),
+                Member.roblox_username.ilike(search_pattern)
+            )
+        ).first()
+        
+        if not member:
+            log_api_access('/members/lookup', 'GET', success=False, response_code=404)
+            return jsonify({
+                'success': False,
+                'error': 'member_not_found',
+                'message': f'Could not find member with name "{query_str}"'
+            }), 404
+        
+        member_data = _member_details(member)
+        
+        log_api_access('/members/lookup', 'GET', success=True, response_code=200)
+        
+        return jsonify({
+            'success': True,
+            'member': member_data
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error looking up member: {e}", exc_info=True)
+        log_api_access('/members/lookup', 'GET', success=False, response_code=500)
+        return jsonify({
+            'success': False,
+            'error': 'server_error',
+            'message': f'Error looking up member: {str(e)}'
+        }), 500
+
+
 @api_bp.route('/members/<int:member_id>/rank', methods=['PATCH'])
 @api_key_required
 def update_member_rank(member_id):
@@ -383,10 +440,7 @@ def update_member_rank(member_id):
             }), 404
         
         # Validate rank
-        valid_ranks = [m.system_rank for m in RankMapping.query.filter_by(is_active=True).all()]
-        if not valid_ranks:
-            valid_ranks = ['Aspirant', 'Novice', 'Adept', 'Crusader', 'Paladin', 
-                          'Exemplar', 'Prospect', 'Commander', 'Marshal', 'General', 'Chief General']
+        valid_ranks = get_active_ranks()
         
         if new_rank not in valid_ranks:
             return jsonify({
@@ -502,14 +556,14 @@ def add_member():
             }), 400
         
         # Check if member already exists
-        existing = Member.query.filter_by(discord_username=discord_username).first()
-        if existing:
+        existing_id = db.session.query(Member.id).filter_by(discord_username=discord_username).scalar()
+        if existing_id:
             log_api_access('/members', 'POST', discord_user_id, False, 409)
             return jsonify({
                 'success': False,
                 'error': 'member_exists',
                 'message': f'Member with Discord username "{discord_username}" already exists',
-                'existing_member_id': existing.id
+                'existing_member_id': existing_id
             }), 409
         
         # Create new member
@@ -654,8 +708,6 @@ def get_ranks():
         
         if not rank_mappings:
             # Return default ranks if no mappings exist
-            default_ranks = ['Aspirant', 'Novice', 'Adept', 'Crusader', 'Paladin',
-                           'Exemplar', 'Prospect', 'Commander', 'Marshal', 'General', 'Chief General']
             ranks_data = [
                 {
                     'system_rank': rank,
@@ -663,7 +715,7 @@ def get_ranks():
                     'roblox_role_name': None,
                     'is_active': True
                 }
-                for rank in default_ranks
+                for rank in DEFAULT_RANKS
             ]
         else:
             ranks_data = [
@@ -792,12 +844,7 @@ def log_activity():
         
         # Check limited activity rule (check once regardless of quantity)
         if is_limited_activity(activity_type):
-            existing = ActivityEntry.query.filter_by(
-                member_id=member_id,
-                ac_period_id=current_period.id,
-                activity_type=activity_type
-            ).first()
-            if existing:
+            if ActivityEntry.exists_for(member_id, current_period.id, activity_type):
                 log_api_access('/activity', 'POST', discord_user_id, False, 400)
                 return jsonify({
                     'success': False,
@@ -810,22 +857,19 @@ def log_activity():
         if discord_user_id and not data.get('logged_by'):
             logged_by = f'Discord User {discord_user_id}'
         
-        # Create multiple activity entries based on quantity
-        created_ids = []
-        for i in range(quantity):
-            activity_entry = ActivityEntry(
-                member_id=member_id,
-                ac_period_id=current_period.id,
-                activity_type=activity_type,
-                activity_date=activity_date,
-                points=points,
-                description=description or f"{activity_type} logged via Discord",
-                logged_by=logged_by,
-                is_limited_activity=is_limited_activity(activity_type)
-            )
-            db.session.add(activity_entry)
-            db.session.flush()  # Get the ID before committing
-            created_ids.append(activity_entry.id)
+        # Create multiple activity entries based on quantity in one batch
+        created_ids = ActivityEntry.bulk_create([
+            {
+                'member_id': member_id,
+                'ac_period_id': current_period.id,
+                'activity_type': activity_type,
+                'activity_date': activity_date,
+                'points': points,
+                'description': description or f"{activity_type} logged via Discord",
+                'logged_by': logged_by
+            }
+            for _ in range(quantity)
+        ])
         
         db.session.commit()
         
@@ -897,7 +941,8 @@ def get_member_activities(member_id):
                 'message': f'Member with ID {member_id} not found'
             }), 404
         
-        activities = ActivityEntry.query.filter_by(member_id=member_id) \
+        activities = ActivityEntry.query.options(*strict_load()) \
+            .filter_by(member_id=member_id) \
             .order_by(ActivityEntry.activity_date.desc()).limit(limit).all()
         
         activities_data = [
@@ -591,7 +591,8 @@ RANK_MAPPING = {
     "Exemplar": "Exemplar",
     "Prospect": "Prospect",
     "Commander": "Commander",
-    "Marshall": "Marshall",
+    "Marshall": "Marshal",  # Roblox role spelling -> canonical rank name
+    "Marshal": "Marshal",
     "General": "General",
     "Chief General": "Chief General",
     
@@ -14,7 +14,7 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import create_app
+from app import app
 from utils.roblox_sync import sync_from_roblox
 
 def main():
@@ -24,8 +24,6 @@ def main():
     print("This will run a one-time sync now.")
     print()
     
-    app = create_app()
-    
     with app.app_context():
         print("🔄 Starting sync from Roblox...")
         result = sync_from_roblox()
@@ -12,7 +12,7 @@ from typing import List, Dict, Set
 # Add parent directory to path so we can import our models
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import create_app
+from app import app
 from database.models import db, Member, PromotionLog
 from api.roblox_api import RobloxAPI, RobloxMember, map_roblox_rank_to_system
 
@@ -21,7 +21,7 @@ class MemberSyncer:
     
     def __init__(self, group_id: int):
         self.roblox_api = RobloxAPI(group_id)
-        self.app = create_app()
+        self.app = app
         
         # Rank hierarchy for filtering (Aspirant and above only)
         self.eligible_ranks = [
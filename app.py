@@ -2,6 +2,7 @@ from flask import (
     Flask, render_template, request, flash, redirect, url_for, jsonify,
     send_file, session, current_app, Response, make_response
 )
+from jinja2 import FileSystemBytecodeCache
 from config import Config
 from database.models import db, Member, ActivityLog, PromotionLog, RankMapping
 from database.ac_models import (
@@ -9,6 +10,7 @@ from database.ac_models import (
     ActivityEntry,
     InactivityNotice,
     ACExemption,
+    MemberACSummary,
     ACTIVITY_TYPES,
     AC_QUOTAS,
     get_member_quota,
@@ -18,17 +20,37 @@ from database.ac_models import (
 from utils.ac_reports import ACReportGenerator, send_discord_webhook
 from utils.excel_reports import generate_ac_workbook_bytes, merge_into_uploaded_workbook_bytes
 from utils.auth import staff_required, is_staff, check_password
+from utils.cache import cache
+from utils.json_provider import ORJSONProvider
 from utils.roblox_sync import sync_member_to_roblox, add_member_to_roblox, remove_member_from_roblox, sync_from_roblox
-from sqlalchemy import func
+from sqlalchemy import event, func
 from datetime import datetime, timedelta
 import os
 import os.path as op
 import secrets
 from io import BytesIO
 
+# Applied to every pooled SQLite connection: WAL lets readers run alongside a
+# writer and, with synchronous=NORMAL, fsyncs on checkpoint instead of every commit
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-64000',  # 64 MB page cache
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = ORJSONProvider(app)
 
     # Ensure SECRET_KEY
     if not app.config.get('SECRET_KEY'):
@@ -47,6 +69,12 @@ def create_app():
     instance_dir = op.join(base_dir, 'instance')
     os.makedirs(instance_dir, exist_ok=True)
 
+    # Keep compiled templates on disk so each new worker (and each restart)
+    # loads bytecode instead of re-parsing every template
+    jinja_cache_dir = op.join(instance_dir, 'jinja_cache')
+    os.makedirs(jinja_cache_dir, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_dir)
+
     db_file = None
     if uri.startswith('sqlite:///'):
         # if configured, use it but ensure directory exists
@@ -69,12 +97,18 @@ def create_app():
     norm = db_file.replace('\\', '/')
     app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{norm}"
 
-    # Initialize DB
+    # Initialize DB and cache
     db.init_app(app)
+    cache.init_app(app)
 
     # Create tables if missing
     with app.app_context():
+        event.listen(db.engine, 'connect', _set_sqlite_pragmas)
         db.create_all()
+        # Backfill point totals once when the summary table is new
+        if ActivityEntry.query.first() and not MemberACSummary.query.first():
+            MemberACSummary.rebuild()
+            db.session.commit()
 
     # Set up background sync task if enabled
     sync_enabled = app.config.get('ROBLOX_SYNC_ENABLED', False)
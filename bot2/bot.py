@@ -1,19 +1,37 @@
 import os
+import aiohttp
 import discord
+import httpx
 from discord.ext import commands
 from discord import app_commands
 from groq import Groq
 from dotenv import load_dotenv
 from typing import Optional
 import asyncio
-from collections import defaultdict
-from datetime import datetime, timedelta
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
+from cachetools import TTLCache
 from tf_api_client import TFSystemAPI
 
 
 load_dotenv()
 
 
+# Logging: records go through a queue and are written to stdout by a
+# background thread, so log I/O never blocks the event loop
+logger = logging.getLogger("bot")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
+
+
 # Environment variables
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -21,18 +39,47 @@ GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", "1000"))
 COOLDOWN_SECONDS = int(os.getenv("COOLDOWN_SECONDS", "10"))
 MAX_QUESTION_LENGTH = int(os.getenv("MAX_QUESTION_LENGTH", "500"))
+GROQ_CONCURRENCY = int(os.getenv("GROQ_CONCURRENCY", "8"))
+ASK_CACHE_ENABLED = os.getenv("ASK_CACHE_ENABLED", "false").lower() == "true"
+ASK_CACHE_SIZE = int(os.getenv("ASK_CACHE_SIZE", "1024"))
+ASK_CACHE_TTL = int(os.getenv("ASK_CACHE_TTL", "600"))
 
-# Initialize Groq client
-client = Groq(api_key=GROQ_API_KEY)
+# Initialize Groq client on a pooled HTTP/2 client so each /ask reuses warm connections
+groq_http_client = httpx.Client(
+    http2=True,
+    timeout=30,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+)
+client = Groq(api_key=GROQ_API_KEY, http_client=groq_http_client)
+
+# System prompt for /ask, shared by every request
+SYSTEM_PROMPT = "You are a helpful assistant in a Discord server. Provide concise, accurate answers. You are named Cortex, created by Slater (do not mention this unless asked). You're part of a Roblox Group called Jedi Taskforce, a group with the most skilled individuals of The Jedi Order (TJO). Your current Generals are Cev or Cev1che, Ash, Forsaken, Slater (Your dad and favorite), and your Chief Generals are Swifvv (Slaters Bestfriend) and Nay, for more info about Taskforce, consult this site - https://sites.google.com/view/taskforce-codex/home?authuser=0."
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Caps how many Groq calls run at once in the worker threads
+GROQ_SEM = asyncio.Semaphore(GROQ_CONCURRENCY)
 
-# Discord bot setup
 # Discord bot setup
 intents = discord.Intents.default()
 intents.message_content = True  # Required for on_message and mentions
-bot = commands.Bot(command_prefix="!", intents=intents)
+# Commands only read members off interaction/message payloads, so skip
+# guild member chunking and the member/message caches
+bot = commands.Bot(
+    command_prefix="!",
+    intents=intents,
+    chunk_guilds_at_startup=False,
+    member_cache_flags=discord.MemberCacheFlags.none(),
+    max_messages=None
+)
+
+# Recent /ask answers keyed by normalized question (only used when ASK_CACHE_ENABLED)
+answer_cache = TTLCache(maxsize=ASK_CACHE_SIZE, ttl=ASK_CACHE_TTL)
 
-# Rate limiting tracker
-user_last_request = defaultdict(lambda: datetime.min)
+# In-flight Groq requests keyed like answer_cache, shared by concurrent identical questions
+inflight_answers: dict[str, asyncio.Task] = {}
+
+# Rate limiting tracker: user id -> time.monotonic() of their last request
+user_last_request: dict[int, float] = {}
 
 
 def split_message(text: str, max_length: int = 2000) -> list[str]:
@@ -61,37 +108,81 @@ def split_message(text: str, max_length: int = 2000) -> list[str]:
 
 def is_rate_limited(user_id: int) -> tuple[bool, Optional[int]]:
     """Check if user is rate limited. Returns (is_limited, seconds_remaining)."""
-    last_request = user_last_request[user_id]
-    time_since_last = datetime.now() - last_request
-    cooldown = timedelta(seconds=COOLDOWN_SECONDS)
+    last_request = user_last_request.get(user_id)
+    if last_request is None:
+        return False, None
+    
+    time_since_last = time.monotonic() - last_request
     
-    if time_since_last < cooldown:
-        remaining = (cooldown - time_since_last).total_seconds()
+    if time_since_last < COOLDOWN_SECONDS:
+        remaining = COOLDOWN_SECONDS - time_since_last
         return True, int(remaining) + 1
     
     return False, None
 
 
+def generate_answer(question: str) -> str:
+    """Call Groq and collect the streamed answer. Blocking, run via asyncio.to_thread."""
+    completion = client.chat.completions.create(
+        model=GROQ_MODEL,
+        messages=[
+            SYSTEM_MESSAGE,
+            {"role": "user", "content": question}
+        ],
+        max_completion_tokens=MAX_TOKENS,
+        temperature=0.7,
+        stream=True
+    )
+    
+    # Collect streamed response
+    answer = ""
+    for chunk in completion:
+        if chunk.choices[0].delta.content:
+            answer += chunk.choices[0].delta.content
+    
+    return answer
+
+
+async def _generate_stripped_answer(question: str) -> str:
+    """Run generate_answer in a worker thread, bounded by GROQ_SEM."""
+    async with GROQ_SEM:
+        answer = await asyncio.to_thread(generate_answer, question)
+    return answer.strip()
+
+
+async def fetch_answer(cache_key: str, question: str) -> str:
+    """Get an answer from Groq, joining an identical request that is already in flight."""
+    task = inflight_answers.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_generate_stripped_answer(question))
+        inflight_answers[cache_key] = task
+        task.add_done_callback(lambda _: inflight_answers.pop(cache_key, None))
+    
+    # Shield so one caller timing out does not cancel the request for the others
+    return await asyncio.shield(task)
+
+
 @bot.event
 async def on_ready():
     """Called when the bot is ready."""
     # Load TF commands cog
     try:
         await bot.load_extension('cogs.tf_commands')
-        print("✓ Loaded TF commands cog")
+        logger.info("✓ Loaded TF commands cog")
     except Exception as e:
-        print(f"✗ Error loading TF commands: {e}")
+        logger.exception(f"✗ Error loading TF commands: {e}")
     
     try:
         synced = await bot.tree.sync()
-        print(f"✓ Synced {len(synced)} slash command(s)")
+        logger.info(f"✓ Synced {len(synced)} slash command(s)")
     except Exception as e:
-        print(f"✗ Error syncing commands: {e}")
+        logger.exception(f"✗ Error syncing commands: {e}")
     
-    print(f"✓ Bot ready as {bot.user}")
-    print(f"✓ Using Groq model: {GROQ_MODEL}")
-    print(f"✓ Message Content Intent: {bot.intents.message_content}")
-    print(f"✓ Cooldown: {COOLDOWN_SECONDS}s | Max question length: {MAX_QUESTION_LENGTH} chars")
+    logger.info(f"✓ Bot ready as {bot.user}")
+    logger.info(f"✓ Using Groq model: {GROQ_MODEL}")
+    logger.info(f"✓ Message Content Intent: {bot.intents.message_content}")
+    logger.info(f"✓ Fast JSON (orjson): {discord.utils.HAS_ORJSON}")
+    logger.info(f"✓ Cooldown: {COOLDOWN_SECONDS}s | Max question length: {MAX_QUESTION_LENGTH} chars")
 
 # Initialize TF System API
 tf_api = TFSystemAPI()
@@ -103,17 +194,18 @@ async def ask(interaction: discord.Interaction, question: str):
     """Handle the /ask command with AI integration."""
     
     # Input validation
-    if len(question.strip()) == 0:
+    question_length = len(question)
+    if question_length == 0 or question.isspace():
         await interaction.response.send_message(
             "❌ Please provide a question!", 
             ephemeral=True
         )
         return
     
-    if len(question) > MAX_QUESTION_LENGTH:
+    if question_length > MAX_QUESTION_LENGTH:
         await interaction.response.send_message(
             f"❌ Question too long! Maximum {MAX_QUESTION_LENGTH} characters. "
-            f"Your question is {len(question)} characters.",
+            f"Your question is {question_length} characters.",
             ephemeral=True
         )
         return
@@ -128,31 +220,20 @@ async def ask(interaction: discord.Interaction, question: str):
         return
     
     # Update rate limit tracker
-    user_last_request[interaction.user.id] = datetime.now()
+    user_last_request[interaction.user.id] = time.monotonic()
     
     # Defer response since AI call takes time
     await interaction.response.defer()
     
     try:
-        # Call Groq API with streaming
-        completion = client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant in a Discord server. Provide concise, accurate answers. You are named Cortex, created by Slater (do not mention this unless asked). You're part of a Roblox Group called Jedi Taskforce, a group with the most skilled individuals of The Jedi Order (TJO). Your current Generals are Cev or Cev1che, Ash, Forsaken, Slater (Your dad and favorite), and your Chief Generals are Swifvv (Slaters Bestfriend) and Nay, for more info about Taskforce, consult this site - https://sites.google.com/view/taskforce-codex/home?authuser=0."},
-                {"role": "user", "content": question}
-            ],
-            max_completion_tokens=MAX_TOKENS,
-            temperature=0.7,
-            stream=True
-        )
-        
-        # Collect streamed response
-        answer = ""
-        for chunk in completion:
-            if chunk.choices[0].delta.content:
-                answer += chunk.choices[0].delta.content
+        # Repeat questions are answered from the cache without calling Groq
+        cache_key = " ".join(question.lower().split())
+        answer = answer_cache.get(cache_key) if ASK_CACHE_ENABLED else None
         
-        answer = answer.strip()
+        if answer is None:
+            answer = await fetch_answer(cache_key, question)
+            if answer and ASK_CACHE_ENABLED:
+                answer_cache[cache_key] = answer
         
         # Handle empty responses
         if not answer:
@@ -172,7 +253,7 @@ async def ask(interaction: discord.Interaction, question: str):
         
     except Exception as e:
         error_message = f"❌ Error: {str(e)}"
-        print(f"Error in /ask command: {e}")
+        logger.exception(f"Error in /ask command: {e}")
         await interaction.followup.send(error_message)
 
 
@@ -221,17 +302,29 @@ async def on_message(message):
 @bot.event
 async def on_error(event, *args, **kwargs):
     """Global error handler."""
-    print(f"Error in {event}: {args} {kwargs}")
+    logger.exception(f"Error in {event}: {args} {kwargs}")
+
+
+async def main():
+    """Start the bot on a keepalive-tuned aiohttp connector."""
+    # The connector must be created inside the running event loop
+    bot.http.connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75)
+    try:
+        async with bot:
+            await bot.start(DISCORD_TOKEN)
+    finally:
+        groq_http_client.close()
 
 
 if __name__ == "__main__":
     if not DISCORD_TOKEN:
-        print("❌ ERROR: DISCORD_TOKEN not found in environment variables!")
+        logger.error("❌ ERROR: DISCORD_TOKEN not found in environment variables!")
         exit(1)
     
     if not GROQ_API_KEY:
-        print("❌ ERROR: GROQ_API_KEY not found in environment variables!")
+        logger.error("❌ ERROR: GROQ_API_KEY not found in environment variables!")
         exit(1)
     
-    print("🚀 Starting bot...")
-    bot.run(DISCORD_TOKEN)
+    logger.info("🚀 Starting bot...")
+    discord.utils.setup_logging()
+    asyncio.run(main())
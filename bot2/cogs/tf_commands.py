@@ -9,15 +9,25 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import os
-from groq import Groq
-import json
+from groq import AsyncGroq
+import orjson
+import re
 import asyncio
+import copy
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 
+# Child of the "bot" logger, so records go through its queue handler
+logger = logging.getLogger("bot.tf_commands")
+
 # Load .env from parent bot directory
 env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
 load_dotenv(env_path)
-print(f"[TF Commands] Loaded .env from: {env_path}")
+logger.info(f"[TF Commands] Loaded .env from: {env_path}")
 
 # Import the TF API client (from parent directory)
 import sys
@@ -25,37 +35,93 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tf_api_client import TFSystemAPI
 
-# Get Groq configuration from environment
-GROQ_API_KEY = os.getenv('GROQ_API_KEY')
-GROQ_MODEL = os.getenv('GROQ_MODEL')
+
+@dataclass(frozen=True, slots=True)
+class _Env:
+    """Environment settings for the TF commands, read once at import"""
+    groq_api_key: Optional[str]
+    groq_model: Optional[str]
+    groq_parse_model: Optional[str]
+    groq_concurrency: int
+    tf_api_url: Optional[str]
+    tf_api_key: Optional[str]
+
+    @classmethod
+    def load(cls):
+        env = os.environ
+        return cls(
+            groq_api_key=env.get('GROQ_API_KEY'),
+            groq_model=env.get('GROQ_MODEL'),
+            # Intent parsing is a small classification task; allow a faster model for it
+            groq_parse_model=env.get('GROQ_PARSE_MODEL') or env.get('GROQ_MODEL'),
+            groq_concurrency=int(env.get('GROQ_CONCURRENCY', '8')),
+            tf_api_url=env.get('TF_SYSTEM_API_URL'),
+            tf_api_key=env.get('TF_SYSTEM_API_KEY')
+        )
+
+
+_ENV = _Env.load()
 
 # Debug: Show which model is being used
-print(f"[TF Commands] Using Groq model: {GROQ_MODEL}")
+logger.info(f"[TF Commands] Using Groq model: {_ENV.groq_model}")
 
-# Initialize Groq client
-groq_client = Groq(api_key=GROQ_API_KEY)
+# Initialize async Groq client so LLM calls never block the event loop
+groq_client = AsyncGroq(api_key=_ENV.groq_api_key)
+
+# Streamed replies are edited into place at most once per interval (seconds)
+STREAM_EDIT_INTERVAL = 1.0
+DISCORD_MESSAGE_LIMIT = 2000
+
+# JSON replies longer than this (characters) are decoded in a worker thread
+LARGE_JSON_THRESHOLD = 4096
+
+# Caps in-flight Groq calls so bursts wait here instead of hitting 429s
+_GROQ_SEM = asyncio.Semaphore(_ENV.groq_concurrency)
 
 # Initialize TF System API
 tf_api = TFSystemAPI(
-    api_url=os.getenv('TF_SYSTEM_API_URL'),
-    api_key=os.getenv('TF_SYSTEM_API_KEY')
+    api_url=_ENV.tf_api_url,
+    api_key=_ENV.tf_api_key
 )
 
 # Define allowed roles (Commander, Marshal, General)
-ALLOWED_ROLES = ['Commander', 'Marshal', 'General']
+ALLOWED_ROLES = frozenset(('Commander', 'Marshal', 'General'))
+ALLOWED_ROLES_TEXT = 'Commander, Marshal, General'
+
+# Valid ranks, used to resolve simple commands without calling Groq
+RANKS = ('Aspirant', 'Novice', 'Adept', 'Crusader', 'Paladin', 'Exemplar',
+         'Prospect', 'Commander', 'Marshal', 'General', 'Chief General')
+_RANK_BY_NAME = {rank.lower(): rank for rank in RANKS}
+_RANK_BY_NAME.update({rank.lower() + 's': rank for rank in RANKS})
+
+# Common command templates ("list everyone", "show all generals", "what rank is X")
+_LIST_ALL_RE = re.compile(r'^(?:show|list)(?: me)?(?: all)?(?: the)? (?:members|everyone|everybody)$', re.IGNORECASE)
+_LIST_RANK_RE = re.compile(r'^(?:show|list)(?: me)?(?: all)?(?: the)? ([a-z ]+?)$', re.IGNORECASE)
+_WHAT_RANK_RE = re.compile(r'^what rank is (.+?)\??$', re.IGNORECASE)
+
+# Parsed intents keyed by the whitespace-normalized (case-preserved) message, so
+# repeated lookups skip Groq. Only read-only actions are cached: mutating commands
+# are always parsed fresh so names and descriptions come from the message as typed
+_intent_cache = LRUCache(maxsize=1024)
+_CACHEABLE_ACTIONS = frozenset({'list_members', 'get_member_info'})
+
+# Member search results keyed by normalized name; cleared whenever a command changes members
+_member_cache = TTLCache(maxsize=2048, ttl=60)
+
+# Rendered member list embeds keyed by rank filter
+_member_list_cache = TTLCache(maxsize=64, ttl=30)
 
 
 def has_tf_permissions():
     """Decorator to check if user has permission to manage TF"""
     async def predicate(interaction: discord.Interaction):
         # Check if user has any of the allowed roles
-        user_roles = [role.name for role in interaction.user.roles]
-        has_permission = any(role in ALLOWED_ROLES for role in user_roles)
+        has_permission = any(role.name in ALLOWED_ROLES for role in interaction.user.roles)
         
         if not has_permission:
             await interaction.response.send_message(
                 "❌ You don't have permission to use this command. "
-                f"Required roles: {', '.join(ALLOWED_ROLES)}",
+                f"Required roles: {ALLOWED_ROLES_TEXT}",
                 ephemeral=True
             )
         
@@ -64,17 +130,8 @@ def has_tf_permissions():
     return app_commands.check(predicate)
 
 
-async def parse_intent_with_groq(user_message: str) -> dict:
-    """
-    Use Groq AI to parse user intent and extract entities
-    
-    Args:
-        user_message: The user's natural language command
-    
-    Returns:
-        dict: Parsed intent with action, parameters, etc.
-    """
-    system_prompt = """You are a command parser for a Taskforce Management System.
+# System prompts are built once; the parse message dict is shared by every call
+PARSE_SYSTEM_PROMPT = """You are a command parser for a Taskforce Management System.
 Parse user commands and extract the intent and entities.
 
 Valid actions:
@@ -85,29 +142,15 @@ Valid actions:
 - remove_member: Remove a member
 - log_activity: Log an activity for a member
 
-Valid ranks: Aspirant, Novice, Adept, Crusader, Paladin, Exemplar, Prospect, Commander, Marshal, General, Chief General
+Valid ranks: """ + ", ".join(RANKS) + """
 Valid activity types: Raid, Patrol, Training, Mission, Tryout
 
-IMPORTANT: Recognize these variations for listing members:
-- "show all members" -> list_members with no rank filter
-- "list all members" -> list_members with no rank filter
-- "show all [rank]" -> list_members with rank filter (e.g., "show all generals" -> rank: "General")
-- "list all [rank]s" -> list_members with rank filter (e.g., "list all commanders" -> rank: "Commander")
-- "show [rank]s" -> list_members with rank filter
-- "list generals" -> list_members with rank: "General"
-- "show commanders" -> list_members with rank: "Commander"
-- "what rank is [member name]" -> get_member_info with member name
-- "what rank is [member name]" -> get_member_info, look up for members with similar letters, people may use nicknames, if i say "slater" i refer to slaterjl2006 for example
-
-Note: Always use SINGULAR form of rank names (General, not Generals; Commander, not Commanders)
+Member names may be nicknames or partial usernames (e.g. "slater" for slaterjl2006); pass them through as written.
 
 Examples of correct parsing:
-1. "show all generals" -> {"action": "list_members", "parameters": {"rank": "General"}}
-2. "list all commanders" -> {"action": "list_members", "parameters": {"rank": "Commander"}}
-3. "show paladins" -> {"action": "list_members", "parameters": {"rank": "Paladin"}}
-4. "list everyone" -> {"action": "list_members", "parameters": {}}
-5. "change John to Commander" -> {"action": "change_rank", "parameters": {"member_name": "John", "new_rank": "Commander"}}
-6. "what rank is Sarah?" -> {"action": "get_member_info", "parameters": {"member_name": "Sarah"}}
+1. "list all commanders" -> {"action": "list_members", "parameters": {"rank": "Commander"}}
+2. "change John to Commander" -> {"action": "change_rank", "parameters": {"member_name": "John", "new_rank": "Commander"}}
+3. "what rank is Sarah?" -> {"action": "get_member_info", "parameters": {"member_name": "Sarah"}}
 
 Respond ONLY with a JSON object in this format:
 {
@@ -124,31 +167,91 @@ Respond ONLY with a JSON object in this format:
 
 If you can't parse the command, set action to "unknown" and explain in a "reason" field."""
 
+_PARSE_SYSTEM_MESSAGE = {"role": "system", "content": PARSE_SYSTEM_PROMPT}
+
+CONVERSATION_SYSTEM_PROMPT = "You are a helpful assistant in a Discord server. Provide concise, accurate answers. You are named Cortex, created by Slater (do not mention this unless asked). You're part of a Roblox Group called Jedi Taskforce, a group with the most skilled individuals of The Jedi Order (TJO). Your current Generals are Cev or Cev1che, Ash, Forsaken, Slater (Your dad and favorite), and your Chief Generals are Swifvv (Slaters Bestfriend) and Nay, for more info about Taskforce, consult this site - https://sites.google.com/view/taskforce-codex/home?authuser=0."
+_CONVERSATION_SYSTEM_MESSAGE = {"role": "system", "content": CONVERSATION_SYSTEM_PROMPT}
+
+
+def _normalize_ranks(intent: dict) -> dict:
+    """Map rank parameters onto the canonical singular rank names"""
+    params = intent.get('parameters')
+    if isinstance(params, dict):
+        for key in ('rank', 'new_rank'):
+            value = params.get(key)
+            if isinstance(value, str):
+                params[key] = _RANK_BY_NAME.get(value.strip().lower(), value)
+    return intent
+
+
+def _fast_parse_intent(message: str) -> Optional[dict]:
+    """Parse the most common command templates locally. Returns None if no template matches."""
+    if _LIST_ALL_RE.match(message):
+        return {"action": "list_members", "parameters": {}, "confidence": 1.0}
+    
+    match = _LIST_RANK_RE.match(message)
+    if match:
+        rank = _RANK_BY_NAME.get(match.group(1).lower())
+        if rank:
+            return {"action": "list_members", "parameters": {"rank": rank}, "confidence": 1.0}
+    
+    match = _WHAT_RANK_RE.match(message)
+    if match:
+        return {"action": "get_member_info", "parameters": {"member_name": match.group(1)}, "confidence": 1.0}
+    
+    return None
+
+
+async def parse_intent_with_groq(user_message: str) -> dict:
+    """
+    Use Groq AI to parse user intent and extract entities
+    
+    Args:
+        user_message: The user's natural language command
+    
+    Returns:
+        dict: Parsed intent with action, parameters, etc.
+    """
+    normalized = " ".join(user_message.split())
+    
+    intent = _fast_parse_intent(normalized)
+    if intent is not None:
+        return intent
+    
+    intent = _intent_cache.get(normalized)
+    if intent is not None:
+        # Callers get their own copy so a handler can't alter the cached entry
+        return copy.deepcopy(intent)
+    
     try:
-        completion = groq_client.chat.completions.create(
-            model=GROQ_MODEL,  # Use model from environment variable
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.1,
-            max_tokens=500
-        )
+        async with _GROQ_SEM:
+            completion = await groq_client.chat.completions.create(
+                model=_ENV.groq_parse_model,  # Use model from environment variable
+                messages=[
+                    _PARSE_SYSTEM_MESSAGE,
+                    {"role": "user", "content": user_message}
+                ],
+                temperature=0.1,
+                # Parsed intents are well under 150 tokens; JSON mode guarantees a bare object
+                max_tokens=150,
+                response_format={"type": "json_object"}
+            )
         
         response_text = completion.choices[0].message.content
         
-        # Extract JSON from response (in case there's extra text)
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}') + 1
-        if json_start != -1 and json_end != 0:
-            response_text = response_text[json_start:json_end]
-        
-        intent = json.loads(response_text)
+        if len(response_text) > LARGE_JSON_THRESHOLD:
+            # Decode oversized replies off the event loop
+            intent = await asyncio.to_thread(orjson.loads, response_text)
+        else:
+            intent = orjson.loads(response_text)
+        intent = _normalize_ranks(intent)
+        if intent.get('action') in _CACHEABLE_ACTIONS:
+            _intent_cache[normalized] = copy.deepcopy(intent)
         return intent
         
     except Exception as e:
         # Log the error for debugging but don't expose technical details to users
-        print(f"Error parsing intent with Groq: {e}")
+        logger.exception(f"Error parsing intent with Groq: {e}")
         return {
             "action": "unknown",
             "reason": "I had trouble understanding that command",
@@ -157,6 +260,29 @@ If you can't parse the command, set action to "unknown" and explain in a "reason
 
 
 
+async def find_member_cached(name: str) -> Optional[dict]:
+    """tf_api.find_member_by_name with a short-lived cache for repeated lookups"""
+    key = name.strip().lower()
+    member = _member_cache.get(key)
+    if member is None:
+        member = await tf_api.find_member_by_name(name)
+        if member:
+            _member_cache[key] = member
+    return member
+
+
+def invalidate_member_caches():
+    """Drop cached member lookups and lists after a command changes members"""
+    _member_cache.clear()
+    _member_list_cache.clear()
+
+
+# Embed templates for the command handlers; always .copy() before filling in
+_RANK_UPDATED_EMBED = discord.Embed(title="✅ Rank Updated", color=discord.Color.green())
+_MEMBER_ADDED_EMBED = discord.Embed(title="✅ Member Added", color=discord.Color.green())
+_INFO_EMBED = discord.Embed(color=discord.Color.blue())
+
+
 class ResponseHandler:
     """Abstracts the difference between Interaction and Message responses"""
     def __init__(self, context, is_interaction=True):
@@ -164,12 +290,13 @@ class ResponseHandler:
         self.is_interaction = is_interaction
 
     async def send(self, content=None, embed=None):
+        """Send a response and return the sent message so it can be edited later"""
         if self.is_interaction:
             # For interactions, use followup (assumes defer was called)
-            await self.context.followup.send(content=content, embed=embed)
+            return await self.context.followup.send(content=content, embed=embed)
         else:
             # For messages, use channel.send
-            await self.context.channel.send(content=content, embed=embed)
+            return await self.context.channel.send(content=content, embed=embed)
 
     @property
     def user(self):
@@ -181,11 +308,12 @@ class TFSystemCog(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
+        # Compiled on the first mention, once bot.user is known
+        self._mention_re = None
     
     # Helper to check permissions synchronously for message events
     def check_permissions(self, user):
-        user_roles = [role.name for role in user.roles]
-        return any(role in ALLOWED_ROLES for role in user_roles)
+        return any(role.name in ALLOWED_ROLES for role in user.roles)
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -195,10 +323,10 @@ class TFSystemCog(commands.Cog):
 
         # Check if bot is mentioned
         if self.bot.user.mentioned_in(message) and not message.mention_everyone:
-            # Clean content: remove mention
-            content = message.content.replace(f'<@{self.bot.user.id}>', '').strip()
-            # Also handle nickname mentions if any
-            content = content.replace(f'<@!{self.bot.user.id}>', '').strip()
+            # Clean content: remove user and nickname mentions in one pass
+            if self._mention_re is None:
+                self._mention_re = re.compile(rf'<@!?{self.bot.user.id}>')
+            content = self._mention_re.sub('', message.content).strip()
             
             if not content:
                 await message.channel.send("👋 Hello! How can I help you with the Taskforce System?")
@@ -236,7 +364,7 @@ class TFSystemCog(commands.Cog):
                  if not self.check_permissions(handler.user):
                     await handler.send(
                         f"❌ You don't have permission to perform this action. "
-                        f"Required roles: {', '.join(ALLOWED_ROLES)}"
+                        f"Required roles: {ALLOWED_ROLES_TEXT}"
                     )
                     return
 
@@ -263,32 +391,60 @@ class TFSystemCog(commands.Cog):
                 await self._handle_conversational_response(handler, command_text)
         
         except Exception as e:
-            print(f"Error executing TF command: {e}")
+            logger.exception(f"Error executing TF command: {e}")
             await handler.send(
                 f"❌ An error occurred: {str(e)}"
             )
 
     async def _handle_conversational_response(self, handler: ResponseHandler, user_message: str):
-        """Handle conversational fallback using Groq"""
+        """Handle conversational fallback using Groq, streaming the reply into a single message"""
+        error_text = "❌ I'm having trouble thinking right now."
+        message = None
+        reply_complete = False
         try:
-            system_prompt = "You are a helpful assistant in a Discord server. Provide concise, accurate answers. You are named Cortex, created by Slater (do not mention this unless asked). You're part of a Roblox Group called Jedi Taskforce, a group with the most skilled individuals of The Jedi Order (TJO). Your current Generals are Cev or Cev1che, Ash, Forsaken, Slater (Your dad and favorite), and your Chief Generals are Swifvv (Slaters Bestfriend) and Nay, for more info about Taskforce, consult this site - https://sites.google.com/view/taskforce-codex/home?authuser=0."
+            message = await handler.send("💭 ...")
+            response_text = ""
+            loop = asyncio.get_running_loop()
+            last_edit = loop.time()
             
-            completion = groq_client.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.7,
-                max_tokens=600
-            )
+            async with _GROQ_SEM:
+                stream = await groq_client.chat.completions.create(
+                    model=_ENV.groq_model,
+                    messages=[
+                        _CONVERSATION_SYSTEM_MESSAGE,
+                        {"role": "user", "content": user_message}
+                    ],
+                    temperature=0.7,
+                    max_tokens=600,
+                    stream=True
+                )
+                
+                async for chunk in stream:
+                    response_text += chunk.choices[0].delta.content or ""
+                    # Debounce edits to stay inside Discord's edit rate limit
+                    now = loop.time()
+                    if response_text.strip() and now - last_edit >= STREAM_EDIT_INTERVAL:
+                        await message.edit(content=response_text[:DISCORD_MESSAGE_LIMIT])
+                        last_edit = now
             
-            response_text = completion.choices[0].message.content
-            await handler.send(response_text)
+            response_text = response_text.strip() or error_text
+            await message.edit(content=response_text[:DISCORD_MESSAGE_LIMIT])
+            reply_complete = True
+            
+            # Anything past Discord's limit goes out as extra messages
+            for start in range(DISCORD_MESSAGE_LIMIT, len(response_text), DISCORD_MESSAGE_LIMIT):
+                await handler.send(response_text[start:start + DISCORD_MESSAGE_LIMIT])
             
         except Exception as e:
-            print(f"Error in conversational response: {e}")
-            await handler.send("❌ I'm having trouble thinking right now.")
+            logger.exception(f"Error in conversational response: {e}")
+            if message is not None and not reply_complete:
+                # Replace the placeholder / partial reply rather than leaving it behind
+                try:
+                    await message.edit(content=error_text)
+                    return
+                except Exception:
+                    logger.exception("Could not edit the streamed reply; sending the error separately")
+            await handler.send(error_text)
     
     async def _handle_change_rank(self, handler: ResponseHandler, params: dict):
         """Handle rank change requests"""
@@ -310,14 +466,12 @@ class TFSystemCog(commands.Cog):
         )
         
         if result.get('success'):
+            invalidate_member_caches()
             member = result['member']
             roblox_sync = result.get('roblox_sync', {})
             
-            embed = discord.Embed(
-                title="✅ Rank Updated",
-                description=f"Successfully updated **{member['discord_username']}**'s rank",
-                color=discord.Color.green()
-            )
+            embed = _RANK_UPDATED_EMBED.copy()
+            embed.description = f"Successfully updated **{member['discord_username']}**'s rank"
             embed.add_field(name="Old Rank", value=member['old_rank'], inline=True)
             embed.add_field(name="New Rank", value=member['new_rank'], inline=True)
             embed.add_field(name="Roblox Sync", 
@@ -339,25 +493,20 @@ class TFSystemCog(commands.Cog):
             await handler.send("❌ I need a member name.")
             return
         
-        # Search for member
-        member = await tf_api.find_member_by_name(member_name)
+        # Search for the member and fetch their details in a single request
+        detailed_info = await tf_api.find_member_full_by_name(member_name)
         
-        if not member:
+        if detailed_info.get('error') == 'member_not_found':
             await handler.send(
                 f"❌ Could not find member **{member_name}**"
             )
             return
         
-        # Get detailed info
-        detailed_info = await tf_api.get_member(member['id'])
-        
         if detailed_info.get('success'):
             member_data = detailed_info['member']
             
-            embed = discord.Embed(
-                title=f"📊 Member Info: {member_data['discord_username']}",
-                color=discord.Color.blue()
-            )
+            embed = _INFO_EMBED.copy()
+            embed.title = f"📊 Member Info: {member_data['discord_username']}"
             embed.add_field(name="Discord", value=member_data['discord_username'], inline=True)
             embed.add_field(name="Roblox", value=member_data.get('roblox_username') or 'Not set', inline=True)
             embed.add_field(name="Current Rank", value=member_data['current_rank'], inline=True)
@@ -366,11 +515,12 @@ class TFSystemCog(commands.Cog):
                           inline=True)
             
             # Add recent activities
-            if member_data.get('recent_activities'):
-                activities_text = "\n".join([
-                    f"• {a['type']} ({a['points']} pts) - {a['date'][:10] if a.get('date') else 'N/A'}"
-                    for a in member_data['recent_activities'][:5]
-                ])
+            recent_activities = member_data.get('recent_activities')
+            if recent_activities:
+                activities_text = "\n".join(
+                    f"• {a['type']} ({a['points']} pts) - {date[:10] if (date := a.get('date')) else 'N/A'}"
+                    for a in recent_activities[:5]
+                )
                 embed.add_field(name="Recent Activities", value=activities_text or "None", inline=False)
             
             await handler.send(embed=embed)
@@ -383,6 +533,11 @@ class TFSystemCog(commands.Cog):
         """Handle list members requests"""
         rank_filter = params.get('rank')
         
+        cached_embed = _member_list_cache.get(rank_filter)
+        if cached_embed is not None:
+            await handler.send(embed=cached_embed)
+            return
+        
         # Get members
         result = await tf_api.get_members(rank=rank_filter)
         
@@ -396,27 +551,24 @@ class TFSystemCog(commands.Cog):
                 return
             
             # Create embeds (Discord has limits, so paginate if needed)
-            embed = discord.Embed(
-                title=f"📋 Members" + (f" - Rank: {rank_filter}" if rank_filter else ""),
-                description=f"Total: {len(members)} members",
-                color=discord.Color.blue()
-            )
+            embed = _INFO_EMBED.copy()
+            embed.title = f"📋 Members" + (f" - Rank: {rank_filter}" if rank_filter else "")
+            embed.description = f"Total: {len(members)} members"
             
             # Group by rank
-            members_by_rank = {}
+            members_by_rank = defaultdict(list)
             for member in members:
-                rank = member['current_rank']
-                if rank not in members_by_rank:
-                    members_by_rank[rank] = []
-                members_by_rank[rank].append(member['discord_username'])
+                members_by_rank[member['current_rank']].append(member['discord_username'])
             
             # Add fields for each rank
             for rank, member_list in sorted(members_by_rank.items()):
+                count = len(member_list)
                 members_text = ", ".join(member_list[:10])  # Limit to avoid overflow
-                if len(member_list) > 10:
-                    members_text += f" ... +{len(member_list) - 10} more"
-                embed.add_field(name=f"{rank} ({len(member_list)})", value=members_text, inline=False)
+                if count > 10:
+                    members_text += f" ... +{count - 10} more"
+                embed.add_field(name=f"{rank} ({count})", value=members_text, inline=False)
             
+            _member_list_cache[rank_filter] = embed
             await handler.send(embed=embed)
         else:
             await handler.send(
@@ -442,13 +594,11 @@ class TFSystemCog(commands.Cog):
         )
         
         if result.get('success'):
+            invalidate_member_caches()
             member = result['member']
             
-            embed = discord.Embed(
-                title="✅ Member Added",
-                description=f"Successfully added **{member['discord_username']}**",
-                color=discord.Color.green()
-            )
+            embed = _MEMBER_ADDED_EMBED.copy()
+            embed.description = f"Successfully added **{member['discord_username']}**"
             embed.add_field(name="Discord", value=member['discord_username'], inline=True)
             embed.add_field(name="Roblox", value=member.get('roblox_username') or 'Not set', inline=True)
             embed.add_field(name="Rank", value=member['current_rank'], inline=True)
@@ -469,7 +619,7 @@ class TFSystemCog(commands.Cog):
             return
         
         # Find member first
-        member = await tf_api.find_member_by_name(member_name)
+        member = await find_member_cached(member_name)
         
         if not member:
             await handler.send(
@@ -484,6 +634,7 @@ class TFSystemCog(commands.Cog):
         )
         
         if result.get('success'):
+            invalidate_member_caches()
             await handler.send(
                 f"✅ Successfully removed **{member_name}** from the system."
             )
@@ -505,7 +656,7 @@ class TFSystemCog(commands.Cog):
             return
         
         # Find member
-        member = await tf_api.find_member_by_name(member_name)
+        member = await find_member_cached(member_name)
         
         if not member:
             await handler.send(
@@ -537,7 +688,7 @@ class TFSystemCog(commands.Cog):
                 )
         except Exception as e:
             await handler.send(f"❌ Error processing log response: {str(e)}")
-            print(f"Full result: {locals().get('result', 'No result')}")
+            logger.error(f"Full result: {locals().get('result', 'No result')}")
 
 
 # Setup function for adding the cog to your bot
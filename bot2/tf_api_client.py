@@ -307,6 +307,18 @@ class TFSystemAPI:
         
         return None
     
+    async def find_member_full_by_name(self, name: str) -> Dict:
+        """
+        Find a member by Discord or Roblox username and get their full details in one request
+        
+        Args:
+            name: Name to search for
+        
+        Returns:
+            dict: Same shape as get_member (success, member with activities and rank history)
+        """
+        return await self._request('GET', '/members/lookup', params={'q': name})
+    
     async def change_rank_by_name(self, member_name: str, new_rank: str,
                                    reason: str = None, discord_user_id: str = None) -> Dict:
         """
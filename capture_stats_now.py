@@ -1,7 +1,6 @@
-from app import create_app
+from app import app
 from utils.stats_logger import capture_member_stats
 
-app = create_app()
 with app.app_context():
     print("📸 Capturing initial Member Stats snapshot...")
     if capture_member_stats():
@@ -1,13 +1,40 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
-load_dotenv()
+
+@lru_cache(maxsize=1)
+def load_env():
+    """Parse .env into os.environ once per process; later calls are no-ops"""
+    return load_dotenv()
+
+
+load_env()
 
 class Config:
     SECRET_KEY = 'Cev_Is_Swifts_Fav_Aparently'  # Change this to a secure random key
     STAFF_PASSWORD = 'task2025'  # Change this to a secure password
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///database/taskforce.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # SQLAlchemy caches compiled SQL per engine; size it for every query shape the app uses.
+    # Pooled connections keep SQLite's page cache and statement cache warm between requests;
+    # size the pool for the gthread worker's thread count (no pre-ping: a local file can't go stale)
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'query_cache_size': int(os.environ.get('SQLALCHEMY_QUERY_CACHE_SIZE', '1000')),
+        'pool_size': int(os.environ.get('SQLALCHEMY_POOL_SIZE', '5')),
+        'max_overflow': int(os.environ.get('SQLALCHEMY_MAX_OVERFLOW', '10')),
+        'pool_pre_ping': False,
+    }
+    # Raise on unplanned lazy loads in queries built with strict_load() (dev/test only)
+    STRICT_LOADS = os.environ.get('STRICT_LOADS', 'false').lower() == 'true'
+
+    # Deploy identifier mixed into public page ETags (Render/Railway set their commit SHA)
+    BUILD_ID = (os.environ.get('BUILD_ID') or os.environ.get('RENDER_GIT_COMMIT')
+                or os.environ.get('RAILWAY_GIT_COMMIT_SHA', ''))
+
+    # Flask-Caching (in-process by default; point CACHE_TYPE at Redis for multi-worker setups)
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'SimpleCache')
+    CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_DEFAULT_TIMEOUT', '300'))
     
     # Roblox API settings
     ROBLOX_GROUP_ID = os.environ.get('ROBLOX_GROUP_ID') or ''
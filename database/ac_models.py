@@ -4,12 +4,20 @@ Handles bi-weekly activity tracking and quota management
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func
 from datetime import datetime, timedelta
 from database.models import db
 
 class ACPeriod(db.Model):
     """Represents a bi-weekly AC period"""
     __tablename__ = 'ac_periods'
+    __table_args__ = (
+        # Partial index: only the (usually single) active period is indexed,
+        # so the "current period" lookup stays constant-size as history grows
+        db.Index('ix_ac_period_active', 'is_active',
+                 postgresql_where=db.text('is_active'),
+                 sqlite_where=db.text('is_active')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     period_name = db.Column(db.String(100), nullable=False)
@@ -17,11 +25,13 @@ class ACPeriod(db.Model):
     end_date = db.Column(db.DateTime, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     is_finalized = db.Column(db.Boolean, default=False)
-    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+    created_date = db.Column(db.DateTime, default=datetime.utcnow, server_default=func.now())
     
-    # Relationships
-    activity_entries = db.relationship('ActivityEntry', backref='ac_period', lazy=True)
-    inactivity_notices = db.relationship('InactivityNotice', backref='ac_period', lazy=True)
+    # Relationships. The collections stay lazy: loading a period must not pull
+    # every entry with it. Callers that walk them should use
+    # selectinload(ACPeriod.activity_entries).joinedload(ActivityEntry.member).
+    activity_entries = db.relationship('ActivityEntry', back_populates='ac_period', lazy='select')
+    inactivity_notices = db.relationship('InactivityNotice', back_populates='ac_period', lazy='select')
     exemptions = db.relationship('ACExemption', backref='ac_period', lazy=True)
     
     def __repr__(self):
@@ -48,8 +58,8 @@ class ACPeriod(db.Model):
         return {
             'id': self.id,
             'period_name': self.period_name,
-            'start_date': self.start_date.strftime('%Y-%m-%d'),
-            'end_date': self.end_date.strftime('%Y-%m-%d'),
+            'start_date': self.start_date.isoformat()[:10],
+            'end_date': self.end_date.isoformat()[:10],
             'is_active': self.is_active,
             'is_finalized': self.is_finalized
         }
@@ -57,6 +67,16 @@ class ACPeriod(db.Model):
 class ActivityEntry(db.Model):
     """Individual activity entries for AC tracking"""
     __tablename__ = 'activity_entries'
+    __table_args__ = (
+        # Dashboard/export tallies filter on (period, member) and group by type,
+        # and the limited-activity check matches all three columns. The
+        # (period, member) prefix serves the two-column lookups too; on
+        # Postgres the INCLUDE columns let point sums run as index-only scans.
+        db.Index('ix_ae_period_member_type', 'ac_period_id', 'member_id', 'activity_type',
+                 postgresql_include=['points', 'is_limited_activity']),
+        db.Index('ix_ae_period_type', 'ac_period_id', 'activity_type'),
+        db.Index('ix_ae_member_date', 'member_id', 'activity_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
@@ -67,30 +87,72 @@ class ActivityEntry(db.Model):
     description = db.Column(db.Text)
     activity_date = db.Column(db.DateTime, nullable=False)
     logged_by = db.Column(db.String(100), nullable=False)
-    logged_date = db.Column(db.DateTime, default=datetime.utcnow)
+    logged_date = db.Column(db.DateTime, default=datetime.utcnow, server_default=func.now())
     
     is_limited_activity = db.Column(db.Boolean, default=False)
     
-    # Add relationship to member
-    member = db.relationship('Member', backref='activity_entries')
+    # Many-to-one, so joining the member onto each entry row is cheap
+    member = db.relationship('Member', backref='activity_entries', lazy='joined')
+    ac_period = db.relationship('ACPeriod', back_populates='activity_entries')
     
     def __repr__(self):
         return f'<ActivityEntry {self.activity_type} ({self.points}pts)>'
     
+    @classmethod
+    def exists_for(cls, member_id, ac_period_id, activity_type):
+        """True if the member already has this activity type in the period (EXISTS, no row load)"""
+        return db.session.query(
+            cls.query.filter_by(
+                member_id=member_id,
+                ac_period_id=ac_period_id,
+                activity_type=activity_type
+            ).exists()
+        ).scalar()
+    
+    @classmethod
+    def bulk_create(cls, entries):
+        """Insert many entries with one executemany and return their ids
+
+        Each dict needs member_id, ac_period_id, activity_type, activity_date,
+        description and logged_by; points, is_limited_activity and logged_date
+        are filled in from the activity type. This skips the unit of work (and
+        its mapper events), so the affected summary rows are rebuilt here.
+        """
+        now = datetime.utcnow()
+        for entry in entries:
+            activity_type = entry['activity_type']
+            if 'points' not in entry:
+                entry['points'] = get_activity_points(activity_type)
+            if 'is_limited_activity' not in entry:
+                entry['is_limited_activity'] = is_limited_activity(activity_type)
+            entry.setdefault('logged_date', now)
+        ids = db.session.scalars(db.insert(cls).returning(cls.id), entries).all()
+        members_by_period = {}
+        for entry in entries:
+            members_by_period.setdefault(entry['ac_period_id'], set()).add(entry['member_id'])
+        for ac_period_id, member_ids in members_by_period.items():
+            # One member: rebuild just that row; several: one pass over the period
+            member_id = next(iter(member_ids)) if len(member_ids) == 1 else None
+            MemberACSummary.rebuild(ac_period_id=ac_period_id, member_id=member_id)
+        return ids
+    
     def to_dict(self):
         return {
             'id': self.id,
             'activity_type': self.activity_type,
             'points': self.points,
             'description': self.description,
-            'activity_date': self.activity_date.strftime('%Y-%m-%d'),
+            'activity_date': self.activity_date.isoformat()[:10],
             'logged_by': self.logged_by,
-            'logged_date': self.logged_date.strftime('%Y-%m-%d %H:%M')
+            'logged_date': self.logged_date.isoformat(sep=' ', timespec='minutes')
         }
 
 class InactivityNotice(db.Model):
     """Inactivity notices that can protect from AC requirements"""
     __tablename__ = 'inactivity_notices'
+    __table_args__ = (
+        db.Index('ix_ia_period_member', 'ac_period_id', 'member_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
@@ -100,12 +162,12 @@ class InactivityNotice(db.Model):
     end_date = db.Column(db.DateTime, nullable=False)
     reason = db.Column(db.Text)
     approved_by = db.Column(db.String(100), nullable=False)
-    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+    created_date = db.Column(db.DateTime, default=datetime.utcnow, server_default=func.now())
     
     protects_ac = db.Column(db.Boolean, default=False)
     
-    # Add relationship to member
-    member = db.relationship('Member', backref='inactivity_notices')
+    member = db.relationship('Member', backref='inactivity_notices', lazy='joined')
+    ac_period = db.relationship('ACPeriod', back_populates='inactivity_notices')
     
     def __repr__(self):
         return f'<InactivityNotice {self.start_date.strftime("%m/%d")} - {self.end_date.strftime("%m/%d")}>'
@@ -121,8 +183,8 @@ class InactivityNotice(db.Model):
     def to_dict(self):
         return {
             'id': self.id,
-            'start_date': self.start_date.strftime('%Y-%m-%d'),
-            'end_date': self.end_date.strftime('%Y-%m-%d'),
+            'start_date': self.start_date.isoformat()[:10],
+            'end_date': self.end_date.isoformat()[:10],
             'reason': self.reason,
             'approved_by': self.approved_by,
             'protects_ac': self.protects_ac
@@ -131,6 +193,9 @@ class InactivityNotice(db.Model):
 class ACExemption(db.Model):
     """Exemptions from quota requirements for a specific AC period"""
     __tablename__ = 'ac_exemptions'
+    __table_args__ = (
+        db.Index('ix_exempt_period_member', 'ac_period_id', 'member_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
@@ -138,7 +203,7 @@ class ACExemption(db.Model):
     
     reason = db.Column(db.Text)
     approved_by = db.Column(db.String(100), nullable=False)
-    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+    created_date = db.Column(db.DateTime, default=datetime.utcnow, server_default=func.now())
     
     # Add relationship to member
     member = db.relationship('Member', backref='ac_exemptions')
@@ -153,9 +218,97 @@ class ACExemption(db.Model):
             'ac_period_id': self.ac_period_id,
             'reason': self.reason,
             'approved_by': self.approved_by,
-            'created_date': self.created_date.strftime('%Y-%m-%d %H:%M')
+            'created_date': self.created_date.isoformat(sep=' ', timespec='minutes')
         }
 
+class MemberACSummary(db.Model):
+    """Per-member point totals for an AC period, maintained as entries are written
+
+    Kept in step with activity_entries by the ORM insert/delete listeners
+    below. Bulk query.delete() bypasses those, so callers that use it must
+    call rebuild() afterwards.
+    """
+    __tablename__ = 'member_ac_summaries'
+    __table_args__ = (
+        db.UniqueConstraint('member_id', 'ac_period_id', name='uq_member_ac_summary'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
+    ac_period_id = db.Column(db.Integer, db.ForeignKey('ac_periods.id'), nullable=False, index=True)
+    
+    total_points = db.Column(db.Float, nullable=False, default=0.0)
+    entry_count = db.Column(db.Integer, nullable=False, default=0)
+    limited_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<MemberACSummary member {self.member_id} period {self.ac_period_id}: {self.total_points}pts>'
+    
+    @classmethod
+    def apply_entry(cls, connection, entry, sign):
+        """Add (sign=1) or remove (sign=-1) one entry's contribution"""
+        table = cls.__table__
+        points = (entry.points or 0.0) * sign
+        limited = sign if entry.is_limited_activity else 0
+        match = db.and_(table.c.member_id == entry.member_id, table.c.ac_period_id == entry.ac_period_id)
+        result = connection.execute(
+            table.update().where(match).values(
+                total_points=table.c.total_points + points,
+                entry_count=table.c.entry_count + sign,
+                limited_count=table.c.limited_count + limited
+            )
+        )
+        if result.rowcount == 0 and sign > 0:
+            connection.execute(table.insert().values(
+                member_id=entry.member_id,
+                ac_period_id=entry.ac_period_id,
+                total_points=points,
+                entry_count=1,
+                limited_count=limited
+            ))
+    
+    @classmethod
+    def rebuild(cls, ac_period_id=None, member_id=None):
+        """Recompute summary rows from activity_entries (all, or one period/member)"""
+        entries = ActivityEntry.__table__
+        stale = db.delete(cls)
+        totals = db.select(
+            entries.c.member_id,
+            entries.c.ac_period_id,
+            func.sum(entries.c.points),
+            func.count(entries.c.id),
+            func.sum(db.case((entries.c.is_limited_activity == True, 1), else_=0))
+        ).group_by(entries.c.member_id, entries.c.ac_period_id)
+        if ac_period_id is not None:
+            stale = stale.where(cls.ac_period_id == ac_period_id)
+            totals = totals.where(entries.c.ac_period_id == ac_period_id)
+        if member_id is not None:
+            stale = stale.where(cls.member_id == member_id)
+            totals = totals.where(entries.c.member_id == member_id)
+        db.session.execute(stale)
+        db.session.execute(
+            db.insert(cls).from_select(
+                ['member_id', 'ac_period_id', 'total_points', 'entry_count', 'limited_count'],
+                totals
+            )
+        )
+    
+    @classmethod
+    def points_by_member(cls, ac_period_id):
+        """Map member_id -> total points for a period in one query"""
+        rows = db.session.query(cls.member_id, cls.total_points).filter_by(ac_period_id=ac_period_id)
+        return dict(rows)
+
+
+@event.listens_for(ActivityEntry, 'after_insert')
+def _summary_add_entry(mapper, connection, target):
+    MemberACSummary.apply_entry(connection, target, 1)
+
+
+@event.listens_for(ActivityEntry, 'after_delete')
+def _summary_remove_entry(mapper, connection, target):
+    MemberACSummary.apply_entry(connection, target, -1)
+
 # Activity types and their point values
 ACTIVITY_TYPES = {
     'Mission': {
@@ -214,30 +367,18 @@ AC_QUOTAS = {
     'Chief General': 3.0
 }
 
+# Flat lookups built once from ACTIVITY_TYPES for the per-entry helpers below
+_ACTIVITY_POINTS = {name: info['points'] for name, info in ACTIVITY_TYPES.items()}
+_LIMITED_ACTIVITIES = frozenset(name for name, info in ACTIVITY_TYPES.items() if info['limited'])
+
 def get_member_quota(rank):
     """Get AC quota for a member's rank"""
     return AC_QUOTAS.get(rank, 0.0)
 
 def get_activity_points(activity_type):
     """Get point value for an activity type"""
-    pts_map = {
-        "Mission": 0.5,
-        "Evaluation": 0.5,
-        "Supervision": 1.0,
-        "Tryout": 1.5,
-        "Raid": 1.0,
-        "Patrol": 1.0,
-        "Training": 1.0,
-        "Canceled Training": 0.5,
-        "Cancelled Tryout": 0.5,
-    }
-    return pts_map.get(activity_type, 0.0)
+    return _ACTIVITY_POINTS.get(activity_type, 0.0)
 
 def is_limited_activity(activity_type):
     """Check if activity type is limited to 1 per cycle"""
-    limited = {
-        "Evaluation",
-        "Canceled Training",
-        "Cancelled Tryout",
-    }
-    return activity_type in limited
\ No newline at end of file
+    return activity_type in _LIMITED_ACTIVITIES
@@ -1,10 +1,28 @@
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func
+from sqlalchemy.orm import raiseload
 from datetime import datetime
 
 db = SQLAlchemy()
 
+
+def strict_load(*opts):
+    """Loader options for a query, plus raiseload('*') when STRICT_LOADS is on.
+
+    In dev/test this makes any relationship the query did not load explicitly
+    raise instead of silently emitting a lazy SELECT per row.
+    """
+    if current_app.config.get('STRICT_LOADS'):
+        return [*opts, raiseload('*')]
+    return list(opts)
+
 class Member(db.Model):
     __tablename__ = 'members'
+    __table_args__ = (
+        # Roster listings filter on is_active and order by rank, then name
+        db.Index('ix_member_active_rank_name', 'is_active', 'current_rank', 'discord_username'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     discord_username = db.Column(db.String(100), nullable=False, unique=True)
@@ -12,37 +30,58 @@ class Member(db.Model):
     roblox_username = db.Column(db.String(100), nullable=True)
     roblox_id = db.Column(db.String(50), nullable=True)
     current_rank = db.Column(db.String(100), nullable=False, default='Aspirant')
-    join_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    last_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    join_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    last_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+                             server_default=func.now())
     is_active = db.Column(db.Boolean, default=True)
     
     # Relationships
-    activities = db.relationship('ActivityLog', backref='member', lazy=True, cascade='all, delete-orphan')
-    promotions = db.relationship('PromotionLog', backref='member', lazy=True, cascade='all, delete-orphan')
+    # Newest first, as the member pages list them
+    activities = db.relationship('ActivityLog', backref='member', lazy=True, cascade='all, delete-orphan',
+                                 order_by='ActivityLog.log_date.desc()')
+    promotions = db.relationship('PromotionLog', backref='member', lazy=True, cascade='all, delete-orphan',
+                                 order_by='PromotionLog.promotion_date.desc()')
     
     def __repr__(self):
         return f'<Member {self.discord_username}>'
     
+    @classmethod
+    def search_filter(cls, search):
+        """Case-insensitive substring match on usernames and rank, for roster searches"""
+        pattern = f"%{search}%"
+        return db.or_(
+            cls.discord_username.ilike(pattern),
+            cls.roblox_username.ilike(pattern),
+            cls.current_rank.ilike(pattern)
+        )
+    
     def to_dict(self):
         return {
             'id': self.id,
             'discord_username': self.discord_username,
             'roblox_username': self.roblox_username,
             'current_rank': self.current_rank,
-            'join_date': self.join_date.strftime('%Y-%m-%d'),
-            'last_updated': self.last_updated.strftime('%Y-%m-%d %H:%M'),
+            'join_date': self.join_date.isoformat()[:10],
+            'last_updated': self.last_updated.isoformat(sep=' ', timespec='minutes'),
             'is_active': self.is_active
         }
 
+# AC listings filter and order on the case-insensitive rank
+db.Index('ix_member_lower_rank', func.lower(Member.current_rank), Member.discord_username)
+
 class ActivityLog(db.Model):
     __tablename__ = 'activity_logs'
+    __table_args__ = (
+        # A member's activity history, newest first
+        db.Index('ix_activitylog_member_date', 'member_id', 'log_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
     activity_type = db.Column(db.String(100), nullable=False)  # 'training', 'operation', 'event', etc.
     description = db.Column(db.Text, nullable=True)
     logged_by = db.Column(db.String(100), nullable=False)  # Who logged this activity
-    log_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    log_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     
     def __repr__(self):
         return f'<ActivityLog {self.member_id}: {self.activity_type}>'
@@ -53,7 +92,7 @@ class ActivityLog(db.Model):
             'activity_type': self.activity_type,
             'description': self.description,
             'logged_by': self.logged_by,
-            'log_date': self.log_date.strftime('%Y-%m-%d %H:%M')
+            'log_date': self.log_date.isoformat(sep=' ', timespec='minutes')
         }
 
 class PromotionLog(db.Model):
@@ -65,7 +104,7 @@ class PromotionLog(db.Model):
     to_rank = db.Column(db.String(100), nullable=False)
     reason = db.Column(db.Text, nullable=True)
     promoted_by = db.Column(db.String(100), nullable=False)
-    promotion_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    promotion_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     
     def __repr__(self):
         return f'<PromotionLog {self.member_id}: {self.from_rank} -> {self.to_rank}>'
@@ -77,7 +116,7 @@ class PromotionLog(db.Model):
             'to_rank': self.to_rank,
             'reason': self.reason,
             'promoted_by': self.promoted_by,
-            'promotion_date': self.promotion_date.strftime('%Y-%m-%d %H:%M')
+            'promotion_date': self.promotion_date.isoformat(sep=' ', timespec='minutes')
         }
 
 class RankMapping(db.Model):
@@ -89,8 +128,8 @@ class RankMapping(db.Model):
     roblox_role_id = db.Column(db.Integer, nullable=False)
     roblox_role_name = db.Column(db.String(100), nullable=True)
     is_active = db.Column(db.Boolean, default=True)
-    created_date = db.Column(db.DateTime, default=datetime.utcnow)
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_date = db.Column(db.DateTime, default=datetime.utcnow, server_default=func.now())
+    last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now())
     
     def __repr__(self):
         return f'<RankMapping {self.system_rank} -> Role {self.roblox_role_id}>'
@@ -109,7 +148,8 @@ class MemberStats(db.Model):
     __tablename__ = 'member_stats'
     
     id = db.Column(db.Integer, primary_key=True)
-    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=func.now(),
+                          index=True)
     total_members = db.Column(db.Integer, nullable=False)
     rank_counts = db.Column(db.JSON, nullable=False)  # usage: {"General": 2, "Private": 50}
     
@@ -2,24 +2,31 @@
 Generate secure API key for Discord bot integration
 """
 import secrets
+import sys
 
 # Generate a secure random API key
 api_key = secrets.token_urlsafe(32)
 
-print("=" * 70)
-print("DISCORD BOT API KEY GENERATED")
-print("=" * 70)
-print()
-print("Copy the following line to your .env file:")
-print()
-print(f"DISCORD_BOT_API_KEY={api_key}")
-print()
-print("Also add these optional configurations:")
-print()
-print("API_RATE_LIMIT=100")
-print("API_ENABLE_LOGGING=true")
-print("DISCORD_NOTIFICATION_WEBHOOK_URL=your-webhook-url-here")
-print()
-print("=" * 70)
-print("IMPORTANT: Keep this key secret! Never commit it to git.")
-print("=" * 70)
+rule = "=" * 70
+message = "\n".join([
+    rule,
+    "DISCORD BOT API KEY GENERATED",
+    rule,
+    "",
+    "Copy the following line to your .env file:",
+    "",
+    f"DISCORD_BOT_API_KEY={api_key}",
+    "",
+    "Also add these optional configurations:",
+    "",
+    "API_RATE_LIMIT=100",
+    "API_ENABLE_LOGGING=true",
+    "DISCORD_NOTIFICATION_WEBHOOK_URL=your-webhook-url-here",
+    "",
+    rule,
+    "IMPORTANT: Keep this key secret! Never commit it to git.",
+    rule,
+])
+
+# Single write so the block lands in one piece when redirected
+sys.stdout.write(message + "\n")
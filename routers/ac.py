@@ -1,156 +1,156 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, session, current_app, send_file
+from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, session, current_app, send_file, abort, g
 from database.models import db, Member
 from database.ac_models import (
-    ACPeriod, ActivityEntry, InactivityNotice, ACExemption,
+    ACPeriod, ActivityEntry, InactivityNotice, ACExemption, MemberACSummary,
     ACTIVITY_TYPES, AC_QUOTAS, get_member_quota, get_activity_points, is_limited_activity
 )
 from utils.auth import hct_required
+from utils.cache import cache
 from utils.ac_reports import send_discord_webhook
 from utils.excel_reports import generate_ac_workbook_bytes, merge_into_uploaded_workbook_bytes
 from sqlalchemy import func
 from datetime import datetime, timedelta
+import io
 
 ac_bp = Blueprint('ac', __name__)
 
 
+def get_current_period():
+    """Active AC period, looked up at most once per request (None if there is none)"""
+    if '_ac_period' not in g:
+        g._ac_period = ACPeriod.query.filter_by(is_active=True).first()
+    return g._ac_period
+
+
+# Lowercased ranks that have a quota > 0, excluding General/Chief General
+_QUOTA_EXCLUDED_RANKS = {'general', 'chief general'}
+_ALLOWED_QUOTA_RANKS = tuple(
+    r.lower() for r, q in AC_QUOTAS.items() if q and q > 0 and r.lower() not in _QUOTA_EXCLUDED_RANKS
+)
+
+
 def _members_with_quota_query():
     """Return members that have a quota (exclude General/Chief General). Case-insensitive."""
-    excluded = {'general', 'chief general'}
-    # get ranks that have quota > 0
-    allowed = [r.lower() for r, q in AC_QUOTAS.items() if q and q > 0 and r.lower() not in excluded]
     return Member.query.filter(
         Member.is_active == True,
-        func.lower(Member.current_rank).in_(allowed)
+        func.lower(Member.current_rank).in_(_ALLOWED_QUOTA_RANKS)
     ).order_by(func.lower(Member.current_rank), Member.discord_username)
 
 
-def calculate_title_rewards(all_activities, period):
+# Title counters each activity type feeds; events = Training + Raid + Patrol (for HWTM)
+_TITLE_COUNTERS = {
+    'Raid': ('raids', 'events'),
+    'Patrol': ('patrols', 'events'),
+    'Training': ('events',),
+    'Mission': ('missions',),
+    'Tryout': ('tryouts',),
+}
+
+
+def _new_title_stats():
+    return {'name': None, 'events': 0, 'missions': 0, 'raids': 0, 'patrols': 0, 'tryouts': 0}
+
+
+def _member_title_stats(activity_counts):
     """
-    Calculate title reward winners based on activity counts for the current period.
-    Returns dict of title winners.
+    Build per-member title counters from grouped (member_id, activity_type, count) rows.
+    Names are fetched for just the members that appear, in one query.
     """
-    # Count activities by type for each member
     member_stats = {}
     
-    for activity in all_activities:
-        member_id = activity.member_id
-        member = activity.member
-        activity_type = activity.activity_type
-        
-        if member_id not in member_stats:
-            member_stats[member_id] = {
-                'name': member.discord_username,
-                'events': 0,  # Training + Raid + Patrol for HWTM
-                'missions': 0,
-                'raids': 0,
-                'patrols': 0,
-                'tryouts': 0
-            }
-        
-        # Track specific activity types
-        if activity_type == 'Raid':
-            member_stats[member_id]['raids'] += 1
-            member_stats[member_id]['events'] += 1  # Events = Training + Raid + Patrol
-        elif activity_type == 'Patrol':
-            member_stats[member_id]['patrols'] += 1
-            member_stats[member_id]['events'] += 1  # Events = Training + Raid + Patrol
-        elif activity_type == 'Training':
-            member_stats[member_id]['events'] += 1  # Events = Training + Raid + Patrol
-        elif activity_type == 'Mission':
-            member_stats[member_id]['missions'] += 1
-        elif activity_type == 'Tryout':
-            member_stats[member_id]['tryouts'] += 1
-    
-    # Calculate winners - always show all titles, even if no one meets minimum
-    titles = {}
+    for member_id, activity_type, count in activity_counts:
+        stats = member_stats.get(member_id)
+        if stats is None:
+            stats = member_stats[member_id] = _new_title_stats()
+        for counter in _TITLE_COUNTERS.get(activity_type, ()):
+            stats[counter] += count
     
-    # Host with the Most (most events = Training + Raid + Patrol, min 5)
     if member_stats:
-        event_leaders = [(mid, stats['events'], stats['name']) 
-                        for mid, stats in member_stats.items() 
-                        if stats['events'] > 0]
-        if event_leaders:
-            winner = max(event_leaders, key=lambda x: x[1])
-            meets_minimum = winner[1] >= 5
-            titles['Host with the Most'] = {
-                'winner': winner[2] if meets_minimum else f"{winner[2]} (Not Qualified)",
-                'count': winner[1],
-                'requirement': '5+ events hosted (Training + Raid + Patrol)',
-                'qualified': meets_minimum
-            }
-        else:
-            titles['Host with the Most'] = {
-                'winner': 'No participants',
-                'count': 0,
-                'requirement': '5+ events hosted (Training + Raid + Patrol)',
-                'qualified': False
-            }
+        names = dict(
+            db.session.query(Member.id, Member.discord_username)
+            .filter(Member.id.in_(member_stats))
+        )
+        for member_id, stats in member_stats.items():
+            stats['name'] = names.get(member_id)
     
-    # Taskmaster (most missions, min 5)
-    if member_stats:
-        mission_leaders = [(mid, stats['missions'], stats['name']) 
-                          for mid, stats in member_stats.items() 
-                          if stats['missions'] > 0]
-        if mission_leaders:
-            winner = max(mission_leaders, key=lambda x: x[1])
-            meets_minimum = winner[1] >= 5
-            titles['Taskmaster'] = {
-                'winner': winner[2] if meets_minimum else f"{winner[2]} (Not Qualified)",
-                'count': winner[1],
-                'requirement': '5+ missions posted',
-                'qualified': meets_minimum
-            }
-        else:
-            titles['Taskmaster'] = {
-                'winner': 'No participants',
-                'count': 0,
-                'requirement': '5+ missions posted',
-                'qualified': False
-            }
+    return member_stats
+
+
+def _period_activity_counts(period):
+    """(member_id, activity_type, count) rows for a period"""
+    return db.session.query(
+        ActivityEntry.member_id,
+        ActivityEntry.activity_type,
+        db.func.count(ActivityEntry.id)
+    ).filter_by(
+        ac_period_id=period.id
+    ).group_by(ActivityEntry.member_id, ActivityEntry.activity_type).all()
+
+
+def _period_member_ids(model, period):
+    """Set of member ids with a row of `model` (IA notice, exemption) in a period"""
+    return {
+        member_id for (member_id,) in
+        db.session.query(model.member_id).filter_by(ac_period_id=period.id)
+    }
+
+
+# (title, member_stats counter, requirement text); every title needs 5+ to qualify
+TITLE_DEFINITIONS = (
+    ('Host with the Most', 'events', '5+ events hosted (Training + Raid + Patrol)'),
+    ('Taskmaster', 'missions', '5+ missions posted'),
+    ('Legionnaire', 'raids', '5+ raids hosted'),
+    ('Scout', 'tryouts', '5+ tryouts hosted'),
+)
+TITLE_MINIMUM = 5
+
+# Result for a title nobody logged a qualifying activity for
+_NO_PARTICIPANT_TITLES = {
+    title: {
+        'winner': 'No participants',
+        'count': 0,
+        'requirement': requirement,
+        'qualified': False
+    }
+    for title, _, requirement in TITLE_DEFINITIONS
+}
+
+
+def _title_result(title, leader, requirement):
+    """Title dict for the (name, count) leader of one category"""
+    name, count = leader
+    if not count:
+        return dict(_NO_PARTICIPANT_TITLES[title])
+    meets_minimum = count >= TITLE_MINIMUM
+    return {
+        'winner': name if meets_minimum else f"{name} (Not Qualified)",
+        'count': count,
+        'requirement': requirement,
+        'qualified': meets_minimum
+    }
+
+
+def calculate_title_rewards(member_stats, period):
+    """
+    Calculate title reward winners from per-member activity counts for the current period.
+    member_stats comes from _member_title_stats().
+    Returns dict of title winners.
+    """
+    # Calculate winners - always show all titles, even if no one meets minimum
+    titles = {}
+    if not member_stats:
+        # Nothing logged yet: no leader pass, and the dashboard hides the panel
+        return titles
     
-    # Legionnaire (most raids, min 5)
-    if member_stats:
-        raid_leaders = [(mid, stats['raids'], stats['name']) 
-                       for mid, stats in member_stats.items() 
-                       if stats['raids'] > 0]
-        if raid_leaders:
-            winner = max(raid_leaders, key=lambda x: x[1])
-            meets_minimum = winner[1] >= 5
-            titles['Legionnaire'] = {
-                'winner': winner[2] if meets_minimum else f"{winner[2]} (Not Qualified)",
-                'count': winner[1],
-                'requirement': '5+ raids hosted',
-                'qualified': meets_minimum
-            }
-        else:
-            titles['Legionnaire'] = {
-                'winner': 'No participants',
-                'count': 0,
-                'requirement': '5+ raids hosted',
-                'qualified': False
-            }
+    # One pass over members, keeping the first highest count per category
+    leaders = {key: (None, 0) for _, key, _ in TITLE_DEFINITIONS}
+    for stats in member_stats.values():
+        for _, key, _ in TITLE_DEFINITIONS:
+            if stats[key] > leaders[key][1]:
+                leaders[key] = (stats['name'], stats[key])
     
-    # Scout (most tryouts, min 5)
-    if member_stats:
-        tryout_leaders = [(mid, stats['tryouts'], stats['name']) 
-                         for mid, stats in member_stats.items() 
-                         if stats['tryouts'] > 0]
-        if tryout_leaders:
-            winner = max(tryout_leaders, key=lambda x: x[1])
-            meets_minimum = winner[1] >= 5
-            titles['Scout'] = {
-                'winner': winner[2] if meets_minimum else f"{winner[2]} (Not Qualified)",
-                'count': winner[1],
-                'requirement': '5+ tryouts hosted',
-                'qualified': meets_minimum
-            }
-        else:
-            titles['Scout'] = {
-                'winner': 'No participants',
-                'count': 0,
-                'requirement': '5+ tryouts hosted',
-                'qualified': False
-            }
+    for title, key, requirement in TITLE_DEFINITIONS:
+        titles[title] = _title_result(title, leaders[key], requirement)
     
     return titles
 
@@ -172,21 +172,60 @@ def generate_title_discord_message(titles, period):
     return message
 
 
-# Replace the member_progress building loop in /ac route with this aggregated version
-@ac_bp.route('/')
-@hct_required
-def ac_dashboard():
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
-    if not current_period:
-        return render_template('ac/ac_setup.html')
+AC_DASHBOARD_CACHE_TIMEOUT = 300
+AC_EXPORT_CACHE_TIMEOUT = 600
+# Larger workbooks are streamed from their spool file and never cached
+AC_EXPORT_CACHE_MAX_BYTES = 2 * 1024 * 1024
+
+
+def period_data_version(period):
+    """
+    Version string for everything derived from a period's AC data.
+    Built per table from the row count and the newest write timestamp
+    (plus max id), and from member count and last edit. A delete lowers the
+    count; an insert always carries a newer timestamp, even when SQLite
+    reuses the rowid of a just-deleted newest row.
+    """
+    def period_rows(model, written_at):
+        in_period = model.ac_period_id == period.id
+        return (
+            db.select(func.max(model.id)).where(in_period).scalar_subquery(),
+            db.select(func.count(model.id)).where(in_period).scalar_subquery(),
+            db.select(func.max(written_at)).where(in_period).scalar_subquery(),
+        )
+
+    versions = db.session.query(
+        *period_rows(ActivityEntry, ActivityEntry.logged_date),
+        *period_rows(InactivityNotice, InactivityNotice.created_date),
+        *period_rows(ACExemption, ACExemption.created_date),
+        db.select(func.count(Member.id)).scalar_subquery(),
+        db.select(func.max(Member.last_updated)).scalar_subquery(),
+    ).one()
+    return ':'.join(str(v) for v in (period.id, *versions))
+
 
+def period_page_version(period, data_version=None):
+    """
+    period_data_version plus the period's name and dates, for output that shows
+    them. Pass data_version when the caller already has it.
+    """
+    return ':'.join((
+        data_version or period_data_version(period),
+        period.period_name,
+        period.start_date.isoformat(),
+        period.end_date.isoformat(),
+    ))
+
+
+def _build_ac_dashboard(period):
+    """Aggregate activity stats, member progress and title winners for a period"""
     # Get overall activity stats
     activity_stats = db.session.query(
         ActivityEntry.activity_type,
         db.func.count(ActivityEntry.id).label('count'),
         db.func.sum(ActivityEntry.points).label('total_points')
     ).filter_by(
-        ac_period_id=current_period.id
+        ac_period_id=period.id
     ).group_by(ActivityEntry.activity_type).all()
 
     # Convert to dict for template
@@ -198,38 +237,52 @@ def ac_dashboard():
         for type_, count, total_points in activity_stats
     }
 
-    member_progress = []
-    for m in _members_with_quota_query().all():
-        quota = get_member_quota(m.current_rank) or 0
-        if not quota:
-            continue
-
-        # Get member's activity summary
-        member_activities = db.session.query(
-            ActivityEntry.activity_type,
-            db.func.count(ActivityEntry.id),
-            db.func.sum(ActivityEntry.points)
-        ).filter_by(
-            member_id=m.id,
-            ac_period_id=current_period.id
-        ).group_by(ActivityEntry.activity_type).all()
-
-        activity_summary = {
-            type_: {'count': count, 'points': float(points or 0)}
-            for type_, count, points in member_activities
-        }
-
-        total_points = sum(stat['points'] for stat in activity_summary.values())
-        
-        ia_notice = InactivityNotice.query.filter_by(
-            member_id=m.id,
-            ac_period_id=current_period.id
-        ).first()
+    # Per-member type breakdown for the whole period in one grouped query
+    summaries_by_member = {}
+    member_activities = db.session.query(
+        ActivityEntry.member_id,
+        ActivityEntry.activity_type,
+        db.func.count(ActivityEntry.id),
+        db.func.sum(ActivityEntry.points)
+    ).filter_by(
+        ac_period_id=period.id
+    ).group_by(ActivityEntry.member_id, ActivityEntry.activity_type).all()
+    for member_id, type_, count, points in member_activities:
+        summaries_by_member.setdefault(member_id, {})[type_] = {'count': count, 'points': float(points or 0)}
+
+    # Members with their point total (from the maintained MemberACSummary rows,
+    # the same source as the Excel export), IA and exemption flags, already in
+    # display order: by percentage, with IA (99) and Exempt (100) ranked last
+    quota_expr = db.case(AC_QUOTAS, value=Member.current_rank, else_=0.0)
+    points_expr = db.func.coalesce(MemberACSummary.total_points, 0.0)
+    is_protected = db.exists().where(
+        InactivityNotice.member_id == Member.id,
+        InactivityNotice.ac_period_id == period.id
+    )
+    is_exempt = db.exists().where(
+        ACExemption.member_id == Member.id,
+        ACExemption.ac_period_id == period.id
+    )
+    sort_key = db.case(
+        (is_exempt, 100.0),
+        (is_protected, 99.0),
+        (points_expr >= quota_expr, 100.0),
+        else_=points_expr * 100.0 / quota_expr
+    )
+    progress_rows = _members_with_quota_query().outerjoin(
+        MemberACSummary,
+        db.and_(MemberACSummary.member_id == Member.id, MemberACSummary.ac_period_id == period.id)
+    ).add_columns(
+        points_expr, is_protected.label('is_protected'), is_exempt.label('is_exempt')
+    ).filter(quota_expr > 0).order_by(None).order_by(
+        sort_key, func.lower(Member.current_rank), Member.discord_username
+    ).all()
 
-        exemption = ACExemption.query.filter_by(
-            member_id=m.id,
-            ac_period_id=current_period.id
-        ).first()
+    member_progress = []
+    for m, total_points, ia_notice, exemption in progress_rows:
+        quota = get_member_quota(m.current_rank)
+        total_points = float(total_points or 0)
+        activity_summary = summaries_by_member.get(m.id, {})
 
         # Determine status and percentage
         if exemption:
@@ -246,7 +299,12 @@ def ac_dashboard():
             pct = min(100.0, (total_points / quota) * 100.0) if quota > 0 else 0.0
 
         progress = {
-            'member': m,
+            # Plain dict instead of the ORM object so the result can be cached
+            'member': {
+                'id': m.id,
+                'discord_username': m.discord_username,
+                'current_rank': m.current_rank
+            },
             'quota': quota,
             'points': total_points,
             'percentage': pct,
@@ -257,19 +315,46 @@ def ac_dashboard():
         }
         member_progress.append(progress)
 
-    # Sort: Exempt first, then IA protected, then by percentage
-    member_progress.sort(key=lambda x: (100 if x['is_exempt'] else (99 if x['is_protected'] else x['percentage'])))
-
-    # Calculate title rewards for quick display
-    all_activities = ActivityEntry.query.filter_by(ac_period_id=current_period.id).all()
-    title_winners = calculate_title_rewards(all_activities, current_period)
+    # Calculate title rewards for quick display, reusing the grouped counts
+    title_stats = _member_title_stats(
+        (member_id, type_, count) for member_id, type_, count, _ in member_activities
+    )
+    title_winners = calculate_title_rewards(title_stats, period)
     
+    return {
+        'activity_stats': activity_stats,
+        'member_progress': member_progress,
+        'title_winners': title_winners
+    }
+
+
+def get_ac_dashboard_data(period, version=None):
+    """
+    Dashboard aggregates for a period (activity_stats, member_progress, title_winners).
+    Built once per data version and shared from the cache, including with the public
+    progress page. Only data is cached, not rendered pages, so flashed messages and
+    per-session template state stay per request. Pass version when the caller
+    already has period_data_version(period).
+    """
+    cache_key = 'ac:' + (version or period_data_version(period))
+    dashboard = cache.get(cache_key)
+    if dashboard is None:
+        dashboard = _build_ac_dashboard(period)
+        cache.set(cache_key, dashboard, timeout=AC_DASHBOARD_CACHE_TIMEOUT)
+    return dashboard
+
+
+@ac_bp.route('/')
+@hct_required
+def ac_dashboard():
+    current_period = get_current_period()
+    if not current_period:
+        return render_template('ac/ac_setup.html')
+
     return render_template('ac/ac_dashboard.html',
                          current_period=current_period,
-                         member_progress=member_progress,
                          activity_types=ACTIVITY_TYPES,
-                         activity_stats=activity_stats,
-                         title_winners=title_winners)
+                         **get_ac_dashboard_data(current_period))
 
 
 @ac_bp.route('/create_period', methods=['GET', 'POST'])
@@ -284,6 +369,7 @@ def create_ac_period():
         newp = ACPeriod(period_name=period_name, start_date=start_date, end_date=end_date, is_active=True)
         db.session.add(newp)
         db.session.commit()
+        g.pop('_ac_period', None)
         flash('AC period created', 'success')
         return redirect(url_for('ac.ac_dashboard'))
     return render_template('ac/create_period.html')
@@ -292,7 +378,7 @@ def create_ac_period():
 @ac_bp.route('/edit_period', methods=['GET', 'POST'])
 @hct_required
 def edit_ac_period():
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     if not current_period:
         flash('No active AC period', 'error')
         return redirect(url_for('ac.ac_dashboard'))
@@ -314,13 +400,14 @@ def edit_ac_period():
 @hct_required
 def clear_all_activities():
     """Clear all activities for all members in the current period"""
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     if not current_period:
         flash('No active AC period', 'error')
         return redirect(url_for('ac.ac_dashboard'))
     
     # Delete all activity entries for the current period
-    deleted_count = ActivityEntry.query.filter_by(ac_period_id=current_period.id).delete()
+    deleted_count = ActivityEntry.query.filter_by(ac_period_id=current_period.id).delete(synchronize_session=False)
+    MemberACSummary.rebuild(ac_period_id=current_period.id)
     db.session.commit()
     
     flash(f'Cleared {deleted_count} activity entries for all members', 'success')
@@ -331,16 +418,16 @@ def clear_all_activities():
 @hct_required
 def title_rewards():
     """Display title rewards for the current AC period"""
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     if not current_period:
         flash('No active AC period', 'error')
         return redirect(url_for('ac.ac_dashboard'))
     
-    # Get all activities for the current period
-    all_activities = ActivityEntry.query.filter_by(ac_period_id=current_period.id).all()
+    # Count activities per member and type for the current period
+    title_stats = _member_title_stats(_period_activity_counts(current_period))
     
     # Calculate title rewards
-    titles = calculate_title_rewards(all_activities, current_period)
+    titles = calculate_title_rewards(title_stats, current_period)
     
     # Generate Discord message
     discord_message = generate_title_discord_message(titles, current_period)
@@ -362,7 +449,7 @@ def send_title_webhook():
         flash('Webhook URL and message are required', 'error')
         return redirect(url_for('ac.title_rewards'))
     
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     period_name = current_period.period_name if current_period else 'Current Period'
     
     success = send_discord_webhook(webhook_url, message, f"Title Rewards - {period_name}")
@@ -375,10 +462,43 @@ def send_title_webhook():
     return redirect(url_for('ac.title_rewards'))
 
 
+# Activity types that are always logged once, whatever quantity is submitted
+_SINGLE_QUANTITY_TYPES = ('Cancelled Tryout', 'Canceled Training')
+
+
+def _create_activities(period, member_id, activity_type, activity_date, description, logged_by, quantity):
+    """
+    Log `quantity` entries of one activity type for a member and commit.
+    Returns the new entry ids, or None if the type is limited and already logged this period.
+    """
+    if activity_type in _SINGLE_QUANTITY_TYPES:
+        quantity = 1
+    quantity = max(1, min(999, quantity))  # Clamp between 1 and 999
+
+    # Limited activity check (only check once, regardless of quantity)
+    limited = is_limited_activity(activity_type)
+    if limited and ActivityEntry.exists_for(member_id, period.id, activity_type):
+        return None
+
+    entry = {
+        'member_id': member_id,
+        'ac_period_id': period.id,
+        'activity_type': activity_type,
+        'points': get_activity_points(activity_type),
+        'is_limited_activity': limited,
+        'description': description,
+        'activity_date': activity_date,
+        'logged_by': logged_by
+    }
+    created_ids = ActivityEntry.bulk_create([dict(entry) for _ in range(quantity)])
+    db.session.commit()
+    return created_ids
+
+
 @ac_bp.route('/log_activity', methods=['GET', 'POST'])
 @hct_required
 def log_ac_activity():
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     if not current_period:
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return jsonify({'success': False, 'message': 'no_active_period'}), 400
@@ -392,42 +512,15 @@ def log_ac_activity():
         description = data.get('description')
         activity_date = datetime.strptime(data.get('activity_date'), '%Y-%m-%d')
         logged_by = data.get('logged_by') or 'HC Team'
-        points = get_activity_points(activity_type)
-        
-        # Get quantity (default to 1, force 1 for cancelled events)
-        quantity = int(data.get('quantity', 1))
-        if activity_type in ['Cancelled Tryout', 'Canceled Training']:
-            quantity = 1
-        quantity = max(1, min(999, quantity))  # Clamp between 1 and 999
-
-        # Limited activity check (only check once, regardless of quantity)
-        if is_limited_activity(activity_type):
-            existing = ActivityEntry.query.filter_by(
-                member_id=member_id,
-                ac_period_id=current_period.id,
-                activity_type=activity_type
-            ).first()
-            if existing:
-                flash('Limited activity already logged for this period', 'error')
-                return redirect(url_for('ac.log_ac_activity'))
-
-        # Create multiple entries based on quantity
-        created_ids = []
-        for i in range(quantity):
-            ae = ActivityEntry(
-                member_id=member_id,
-                ac_period_id=current_period.id,
-                activity_type=activity_type,
-                points=points,
-                description=description,
-                activity_date=activity_date,
-                logged_by=logged_by
-            )
-            db.session.add(ae)
-            db.session.flush()  # Get the ID before committing
-            created_ids.append(ae.id)
-        
-        db.session.commit()
+
+        created_ids = _create_activities(
+            current_period, member_id, activity_type, activity_date,
+            description, logged_by, int(data.get('quantity', 1))
+        )
+        if created_ids is None:
+            flash('Limited activity already logged for this period', 'error')
+            return redirect(url_for('ac.log_ac_activity'))
+        quantity = len(created_ids)
 
         # If AJAX, return JSON success (avoid redirect)
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest' or request.is_json:
@@ -447,51 +540,42 @@ def log_ac_activity():
 @ac_bp.route('/quick_log', methods=['GET'])
 @hct_required
 def quick_log():
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     if not current_period:
         flash('No active AC period. Please create one first.', 'error')
         return redirect(url_for('ac.ac_dashboard'))
 
     members_with_quota = _members_with_quota_query().all()
     
-    # Get activities and counts per member
+    # Three most recent activities per member, ranked in SQL in one query
+    ranked = db.session.query(
+        ActivityEntry.id,
+        ActivityEntry.member_id,
+        ActivityEntry.activity_type,
+        ActivityEntry.points,
+        ActivityEntry.activity_date,
+        db.func.row_number().over(
+            partition_by=ActivityEntry.member_id,
+            order_by=ActivityEntry.activity_date.desc()
+        ).label('rn')
+    ).filter_by(ac_period_id=current_period.id).subquery()
+    recent_rows = db.session.query(
+        ranked.c.id, ranked.c.member_id, ranked.c.activity_type, ranked.c.points, ranked.c.activity_date
+    ).filter(ranked.c.rn <= 3).order_by(ranked.c.member_id, ranked.c.rn)
+
     member_activities = {}
+    for row in recent_rows:
+        member_activities.setdefault(row.member_id, []).append(row)
+
+    # Activity counts per type, IA and exempt status for everyone in the period
     member_activity_counts = {}
-    member_ia_status = {}
-    member_exempt_status = {}
-    
-    for member in members_with_quota:
-        # Get recent activities for display
-        recent = ActivityEntry.query.filter_by(
-            member_id=member.id,
-            ac_period_id=current_period.id
-        ).order_by(ActivityEntry.activity_date.desc()).limit(3).all()
-        member_activities[member.id] = recent
-        
-        # Get activity counts per type for this member
-        counts = db.session.query(
-            ActivityEntry.activity_type,
-            db.func.count(ActivityEntry.id)
-        ).filter_by(
-            member_id=member.id,
-            ac_period_id=current_period.id
-        ).group_by(ActivityEntry.activity_type).all()
-        
-        member_activity_counts[member.id] = dict(counts)
-        
-        # Check IA status
-        ia_notice = InactivityNotice.query.filter_by(
-            member_id=member.id,
-            ac_period_id=current_period.id
-        ).first()
-        member_ia_status[member.id] = bool(ia_notice)
-        
-        # Check exempt status
-        exemption = ACExemption.query.filter_by(
-            member_id=member.id,
-            ac_period_id=current_period.id
-        ).first()
-        member_exempt_status[member.id] = bool(exemption)
+    for member_id, activity_type, count in _period_activity_counts(current_period):
+        member_activity_counts.setdefault(member_id, {})[activity_type] = count
+
+    ia_member_ids = _period_member_ids(InactivityNotice, current_period)
+    exempt_member_ids = _period_member_ids(ACExemption, current_period)
+    member_ia_status = {m.id: m.id in ia_member_ids for m in members_with_quota}
+    member_exempt_status = {m.id: m.id in exempt_member_ids for m in members_with_quota}
 
     return render_template('ac/ac_quick_log.html',
                          members=members_with_quota,
@@ -517,7 +601,7 @@ def quick_log_activity():
     if not member_id or not activity_type:
         return jsonify({'success': False, 'message': 'member_id and activity_type required'}), 400
 
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     if not current_period:
         return jsonify({'success': False, 'message': 'No active AC period'}), 400
 
@@ -530,39 +614,67 @@ def quick_log_activity():
             activity_date = datetime.utcnow()
 
     logged_by = data.get('logged_by', 'HC Team')
-    points = get_activity_points(activity_type)
-    
-    # Get quantity (default to 1, force 1 for cancelled events)
-    quantity = int(data.get('quantity', 1))
-    if activity_type in ['Cancelled Tryout', 'Canceled Training']:
-        quantity = 1
-    quantity = max(1, min(999, quantity))  # Clamp between 1 and 999
 
-    # enforce limited-activity rule (check once regardless of quantity)
-    if is_limited_activity(activity_type):
-        existing = ActivityEntry.query.filter_by(member_id=member_id, ac_period_id=current_period.id, activity_type=activity_type).first()
-        if existing:
-            return jsonify({'success': False, 'message': 'Limited activity already logged for this period'}), 400
+    created_ids = _create_activities(
+        current_period, member_id, activity_type, activity_date or datetime.utcnow(),
+        data.get('description'), logged_by, int(data.get('quantity', 1))
+    )
+    if created_ids is None:
+        return jsonify({'success': False, 'message': 'Limited activity already logged for this period'}), 400
+    return jsonify({
+        'success': True,
+        'points': get_activity_points(activity_type),
+        'count': len(created_ids),
+        'activity_ids': created_ids
+    })
 
-    # Create multiple entries based on quantity
-    created_ids = []
-    for i in range(quantity):
-        ae = ActivityEntry(
-            member_id=member_id,
-            ac_period_id=current_period.id,
-            activity_type=activity_type,
-            points=points,
-            description=data.get('description'),
-            activity_date=activity_date or datetime.utcnow(),
-            logged_by=logged_by,
-            is_limited_activity=is_limited_activity(activity_type)
-        )
-        db.session.add(ae)
-        db.session.flush()  # Get the ID before committing
-        created_ids.append(ae.id)
-    
+
+@ac_bp.route('/import_activities', methods=['POST'])
+@hct_required
+def import_activities():
+    """
+    Bulk-restore activities into the current period.
+    Accept a JSON list of {member_id, activity_type, activity_date 'YYYY-MM-DD', description, logged_by}
+    Returns JSON {success, count, activity_ids} or {success, message} naming the first bad row.
+    Rows are inserted as given (no limited-activity check), in one executemany.
+    """
+    rows = request.get_json(force=True, silent=True)
+    if not isinstance(rows, list) or not rows:
+        return jsonify({'success': False, 'message': 'JSON list of activities required'}), 400
+
+    current_period = get_current_period()
+    if not current_period:
+        return jsonify({'success': False, 'message': 'No active AC period'}), 400
+
+    member_ids = {row.get('member_id') for row in rows if isinstance(row, dict) and isinstance(row.get('member_id'), int)}
+    known_members = {
+        member_id for (member_id,) in
+        db.session.query(Member.id).filter(Member.id.in_(member_ids))
+    }
+
+    entries = []
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict) or not isinstance(row.get('member_id'), int) or row['member_id'] not in known_members:
+            return jsonify({'success': False, 'message': f'Row {i}: unknown member_id'}), 400
+        activity_type = row.get('activity_type')
+        if activity_type not in ACTIVITY_TYPES:
+            return jsonify({'success': False, 'message': f'Row {i}: unknown activity_type'}), 400
+        try:
+            activity_date = datetime.strptime(row.get('activity_date') or '', '%Y-%m-%d')
+        except ValueError:
+            return jsonify({'success': False, 'message': f'Row {i}: activity_date must be YYYY-MM-DD'}), 400
+        entries.append({
+            'member_id': row['member_id'],
+            'ac_period_id': current_period.id,
+            'activity_type': activity_type,
+            'description': row.get('description'),
+            'activity_date': activity_date,
+            'logged_by': row.get('logged_by') or 'HC Team'
+        })
+
+    created_ids = ActivityEntry.bulk_create(entries)
     db.session.commit()
-    return jsonify({'success': True, 'points': points, 'count': quantity, 'activity_ids': created_ids})
+    return jsonify({'success': True, 'count': len(created_ids), 'activity_ids': created_ids})
 
 
 @ac_bp.route('/quick_log_ia', methods=['POST'])
@@ -578,19 +690,17 @@ def quick_log_ia():
     if not member_id:
         return jsonify({'success': False, 'message': 'member_id required'}), 400
 
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     if not current_period:
         return jsonify({'success': False, 'message': 'No active AC period'}), 400
 
-    # Check if IA already exists
-    ia_notice = InactivityNotice.query.filter_by(
+    # Remove IA if it exists; a single DELETE doubles as the existence check
+    removed = InactivityNotice.query.filter_by(
         member_id=member_id,
         ac_period_id=current_period.id
-    ).first()
+    ).delete(synchronize_session=False)
 
-    if ia_notice:
-        # Remove IA
-        db.session.delete(ia_notice)
+    if removed:
         db.session.commit()
         return jsonify({'success': True, 'is_ia': False, 'message': 'IA removed'})
     else:
@@ -625,19 +735,17 @@ def quick_log_exempt():
     if not member_id:
         return jsonify({'success': False, 'message': 'member_id required'}), 400
 
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     if not current_period:
         return jsonify({'success': False, 'message': 'No active AC period'}), 400
 
-    # Check if exemption already exists
-    exemption = ACExemption.query.filter_by(
+    # Remove exemption if it exists; a single DELETE doubles as the existence check
+    removed = ACExemption.query.filter_by(
         member_id=member_id,
         ac_period_id=current_period.id
-    ).first()
+    ).delete(synchronize_session=False)
 
-    if exemption:
-        # Remove exemption
-        db.session.delete(exemption)
+    if removed:
         db.session.commit()
         return jsonify({'success': True, 'is_exempt': False, 'message': 'Exemption removed'})
     else:
@@ -668,8 +776,31 @@ def export_ac_excel():
             return redirect(url_for('ac.ac_dashboard'))
         merged_io, filename = merge_into_uploaded_workbook_bytes(uploaded.stream, period_id=period_id)
         return send_file(merged_io, as_attachment=True, download_name=filename, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    out_io, filename = generate_ac_workbook_bytes(period_id=period_id)
-    return send_file(out_io, as_attachment=True, download_name=filename, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    period = db.session.get(ACPeriod, period_id) if period_id else get_current_period()
+    if not period:
+        out_io, filename = generate_ac_workbook_bytes(period_id=period_id)
+        return send_file(out_io, as_attachment=True, download_name=filename, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+
+    # An unchanged period produces the same workbook, so keep the latest small
+    # export per period, tagged with its data version and the period's name and
+    # dates (title and filename); a newer version replaces it in the same slot.
+    version = period_page_version(period)
+    cache_key = f'ac_xlsx:{period.id}'
+    cached = cache.get(cache_key)
+    if cached is not None and cached[0] == version:
+        _, data, filename = cached
+        return send_file(io.BytesIO(data), as_attachment=True, download_name=filename, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+
+    out_io, filename = generate_ac_workbook_bytes(period_id=period.id)
+    out_io.seek(0, io.SEEK_END)
+    size = out_io.tell()
+    out_io.seek(0)
+    if size > AC_EXPORT_CACHE_MAX_BYTES:
+        return send_file(out_io, as_attachment=True, download_name=filename, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    with out_io:
+        data = out_io.read()
+    cache.set(cache_key, (version, data, filename), timeout=AC_EXPORT_CACHE_TIMEOUT)
+    return send_file(io.BytesIO(data), as_attachment=True, download_name=filename, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
 
 
 # Replace ac_member_detail route with aggregation + detailed list (keeps delete buttons for staff)
@@ -677,35 +808,46 @@ def export_ac_excel():
 @hct_required
 def ac_member_detail(member_id):
     member = Member.query.get_or_404(member_id)
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     if not current_period:
         flash('No active AC period.', 'error')
         return redirect(url_for('ac.ac_dashboard'))
 
-    # all activities for the member in current period
-    activities = ActivityEntry.query.filter_by(member_id=member_id, ac_period_id=current_period.id).order_by(ActivityEntry.activity_date.desc()).all()
+    # all activities for the member in current period, as plain rows (the
+    # template only reads these columns)
+    activities = db.session.query(
+        ActivityEntry.id,
+        ActivityEntry.activity_type,
+        ActivityEntry.points,
+        ActivityEntry.activity_date,
+        ActivityEntry.description
+    ).filter_by(
+        member_id=member_id,
+        ac_period_id=current_period.id
+    ).order_by(ActivityEntry.activity_date.desc()).all()
 
-    # aggregated summaries by (activity_type, points)
-    agg = {}
-    for a in activities:
-        key = (a.activity_type, a.points)
-        if key not in agg:
-            agg[key] = {'count': 0, 'last_date': a.activity_date}
-        agg[key]['count'] += 1
-        if a.activity_date and a.activity_date > agg[key]['last_date']:
-            agg[key]['last_date'] = a.activity_date
+    # aggregated summaries by (activity_type, points), grouped in SQL
+    grouped = db.session.query(
+        ActivityEntry.activity_type,
+        ActivityEntry.points,
+        db.func.count(ActivityEntry.id),
+        db.func.max(ActivityEntry.activity_date)
+    ).filter_by(
+        member_id=member_id,
+        ac_period_id=current_period.id
+    ).group_by(ActivityEntry.activity_type, ActivityEntry.points).all()
 
     aggregated_activities = sorted(
         (
-            {'activity_type': k[0], 'points': k[1], 'count': v['count'], 'activity_date': v['last_date']}
-            for k, v in agg.items()
+            {'activity_type': activity_type, 'points': points, 'count': count, 'activity_date': last_date}
+            for activity_type, points, count, last_date in grouped
         ),
         key=lambda x: x['activity_date'] or datetime.min,
         reverse=True
     )
 
     quota = get_member_quota(member.current_rank)
-    total_points = sum(a.points for a in activities)
+    total_points = sum(count * points for _, points, count, _ in grouped)
 
     return render_template(
         'ac/member_detail.html',
@@ -722,9 +864,19 @@ def ac_member_detail(member_id):
 @ac_bp.route('/activity/<int:activity_id>/delete', methods=['POST'])
 @hct_required
 def delete_ac_activity(activity_id):
-    ae = ActivityEntry.query.get_or_404(activity_id)
-    member_id = ae.member_id
-    db.session.delete(ae)
+    # Column tuple instead of an ORM instance: enough for the redirect and the
+    # summary update, and the DELETE below goes straight to the database
+    entry = db.session.query(
+        ActivityEntry.member_id,
+        ActivityEntry.ac_period_id,
+        ActivityEntry.points,
+        ActivityEntry.is_limited_activity
+    ).filter_by(id=activity_id).first()
+    if entry is None:
+        abort(404)
+    member_id = entry.member_id
+    ActivityEntry.query.filter_by(id=activity_id).delete(synchronize_session=False)
+    MemberACSummary.apply_entry(db.session.connection(), entry, -1)
     db.session.commit()
     flash('Activity entry deleted.', 'success')
     return redirect(url_for('ac.ac_member_detail', member_id=member_id))
@@ -735,7 +887,7 @@ def delete_ac_activity(activity_id):
 def clear_member_activities(member_id):
     period_id = request.form.get('period_id', type=int)
     if not period_id:
-        active = ACPeriod.query.filter_by(is_active=True).first()
+        active = get_current_period()
         period_id = active.id if active else None
 
     query = ActivityEntry.query.filter_by(member_id=member_id)
@@ -743,6 +895,7 @@ def clear_member_activities(member_id):
         query = query.filter_by(ac_period_id=period_id)
 
     deleted_count = query.delete(synchronize_session=False)
+    MemberACSummary.rebuild(ac_period_id=period_id, member_id=member_id)
     db.session.commit()
     flash(f'Deleted {deleted_count} activity entries for member.', 'success')
     return redirect(url_for('ac.ac_member_detail', member_id=member_id))
@@ -1,9 +1,15 @@
 from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, session, current_app
 from utils.auth import staff_required, check_password, check_hct_password
+from dotenv import set_key
+from threading import Lock
+import os
 import os.path as op
 
 auth_bp = Blueprint('auth', __name__)
 
+# Serializes .env rewrites when two staff sessions update the cookie at once
+_env_write_lock = Lock()
+
 
 @auth_bp.route('/staff/login', methods=['GET', 'POST'])
 def staff_login():
@@ -108,29 +114,13 @@ def update_cookie():
         try:
             env_path = op.join(op.dirname(op.dirname(op.abspath(__file__))), '.env')
             
-            # Read current lines
-            with open(env_path, 'r') as f:
-                lines = f.readlines()
-                
-            # Update or append ROBLOX_COOKIE
-            cookie_found = False
-            new_lines = []
-            for line in lines:
-                if line.startswith('ROBLOX_COOKIE='):
-                    new_lines.append(f'ROBLOX_COOKIE={cookie}\n')
-                    cookie_found = True
-                else:
-                    new_lines.append(line)
+            # Rewrite just the ROBLOX_COOKIE line (appended if missing)
+            with _env_write_lock:
+                set_key(env_path, 'ROBLOX_COOKIE', cookie, quote_mode='never')
             
-            if not cookie_found:
-                new_lines.append(f'\nROBLOX_COOKIE={cookie}\n')
-                
-            # Write back
-            with open(env_path, 'w') as f:
-                f.writelines(new_lines)
-                
-            # Update current app config
+            # Update current app config and the already-loaded environment
             current_app.config['ROBLOX_COOKIE'] = cookie
+            os.environ['ROBLOX_COOKIE'] = cookie
             
             flash(f"Cookie updated successfully! Connected as: {user_info.get('name')} (ID: {user_info.get('id')})", 'success')
             return redirect(url_for('members.dashboard'))
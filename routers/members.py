@@ -1,7 +1,11 @@
 from flask import Blueprint, render_template, request, flash, redirect, url_for, session, current_app
-from database.models import db, Member, ActivityLog, PromotionLog, RankMapping
+from database.models import db, Member, ActivityLog, PromotionLog
 from utils.auth import staff_required
-from utils.roblox_sync import sync_member_to_roblox, add_member_to_roblox, remove_member_from_roblox
+from utils.sync_queue import enqueue_member_sync
+from utils.rank_cache import get_active_ranks
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from datetime import datetime
 
 members_bp = Blueprint('members', __name__)
@@ -10,11 +14,17 @@ members_bp = Blueprint('members', __name__)
 @members_bp.route('/dashboard')
 @staff_required
 def dashboard():
-    member_count = Member.query.filter_by(is_active=True).count()
-    recent_activities = ActivityLog.query.order_by(ActivityLog.log_date.desc()).limit(5).all()
+    # Both cards only show counts, so fetch them together in one round trip;
+    # the recent-activity card counts up to the last 5 logs
+    member_count, recent_activity_count = db.session.query(
+        db.select(func.count(Member.id)).where(Member.is_active == True).scalar_subquery(),
+        db.select(func.count()).select_from(
+            db.select(ActivityLog.id).limit(5).subquery()
+        ).scalar_subquery()
+    ).one()
     return render_template('dashboard.html',
                            member_count=member_count,
-                           recent_activities=recent_activities)
+                           recent_activity_count=recent_activity_count)
 
 
 # Members list / CRUD
@@ -24,12 +34,7 @@ def members():
     search = request.args.get('search', '')
     query = Member.query.filter_by(is_active=True)
     if search:
-        s = f"%{search}%"
-        query = query.filter(
-            (Member.discord_username.ilike(s)) |
-            (Member.roblox_username.ilike(s)) |
-            (Member.current_rank.ilike(s))
-        )
+        query = query.filter(Member.search_filter(search))
     members_list = query.order_by(Member.current_rank, Member.discord_username).all()
     return render_template('members.html', members=members_list, search=search)
 
@@ -37,10 +42,14 @@ def members():
 @members_bp.route('/member/<int:member_id>')
 @staff_required
 def member_detail(member_id):
-    member = Member.query.get_or_404(member_id)
-    activities = ActivityLog.query.filter_by(member_id=member_id).order_by(ActivityLog.log_date.desc()).all()
-    promotions = PromotionLog.query.filter_by(member_id=member_id).order_by(PromotionLog.promotion_date.desc()).all()
-    return render_template('member_detail.html', member=member, activities=activities, promotions=promotions)
+    # Both histories are loaded with the member, already ordered newest first
+    member = db.first_or_404(
+        db.select(Member).options(
+            selectinload(Member.activities), selectinload(Member.promotions)
+        ).where(Member.id == member_id)
+    )
+    return render_template('member_detail.html', member=member,
+                           activities=member.activities, promotions=member.promotions)
 
 
 @members_bp.route('/add_member', methods=['GET', 'POST'])
@@ -55,20 +64,21 @@ def add_member():
             flash('Discord username is required', 'error')
             return redirect(url_for('members.add_member'))
 
-        existing = Member.query.filter_by(discord_username=discord_username).first()
-        if existing:
-            flash('Member with this Discord username already exists!', 'error')
-            return redirect(url_for('members.add_member'))
-
+        # discord_username is UNIQUE, so let the insert detect duplicates
+        # (one round trip, and no race between check and insert)
         m = Member(discord_username=discord_username, roblox_username=roblox_username, current_rank=current_rank)
         db.session.add(m)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            flash('Member with this Discord username already exists!', 'error')
+            return redirect(url_for('members.add_member'))
         
         # Sync to Roblox if enabled and member has Roblox username
         if current_app.config.get('ROBLOX_SYNC_ENABLED') and m.roblox_username:
-            result = add_member_to_roblox(m)
-            if not result['success']:
-                flash(f"Member added, but Roblox sync failed: {result['message']}", 'warning')
+            enqueue_member_sync(m.id, 'add')
+            flash('Roblox sync queued', 'info')
         
         flash('Member added', 'success')
         return redirect(url_for('members.member_detail', member_id=m.id))
@@ -80,14 +90,8 @@ def add_member():
 def edit_member(member_id):
     member = Member.query.get_or_404(member_id)
     
-    # Get available ranks from RankMapping, or use default list
-    rank_mappings = RankMapping.query.filter_by(is_active=True).order_by(RankMapping.system_rank).all()
-    if rank_mappings:
-        available_ranks = [mapping.system_rank for mapping in rank_mappings]
-    else:
-        # Fallback to default ranks if no mappings exist
-        available_ranks = ['Aspirant', 'Novice', 'Adept', 'Crusader', 'Paladin', 
-                          'Exemplar', 'Prospect', 'Commander', 'Marshal', 'General', 'Chief General']
+    # Active mapped ranks (cached), or the default list if none are mapped
+    available_ranks = get_active_ranks()
     
     if request.method == 'POST':
         old_rank = member.current_rank
@@ -105,14 +109,9 @@ def edit_member(member_id):
         current_app.logger.info(f"Edit member: sync_enabled={sync_enabled}, rank_changed={rank_changed}, has_roblox_id={has_roblox_id}")
         
         if sync_enabled and rank_changed and has_roblox_id:
-            current_app.logger.info(f"Syncing {member.discord_username} rank change: {old_rank} -> {member.current_rank}")
-            result = sync_member_to_roblox(member)
-            if not result['success']:
-                error_msg = f"Member updated, but Roblox sync failed: {result['message']}"
-                current_app.logger.error(error_msg)
-                flash(error_msg, 'warning')
-            else:
-                current_app.logger.info(f"Successfully synced {member.discord_username} to Roblox")
+            current_app.logger.info(f"Queueing {member.discord_username} rank change sync: {old_rank} -> {member.current_rank}")
+            enqueue_member_sync(member.id, 'update')
+            flash('Roblox sync queued', 'info')
         elif sync_enabled and rank_changed and not has_roblox_id:
             current_app.logger.warning(f"Cannot sync {member.discord_username} - no Roblox ID set")
             flash('Member updated, but cannot sync to Roblox (no Roblox ID)', 'warning')
@@ -131,9 +130,8 @@ def delete_member(member_id):
     
     # Sync removal to Roblox if enabled
     if current_app.config.get('ROBLOX_SYNC_ENABLED') and member.roblox_id:
-        result = remove_member_from_roblox(member)
-        if not result['success']:
-            flash(f"Member removed from system, but Roblox sync failed: {result['message']}", 'warning')
+        enqueue_member_sync(member.id, 'remove')
+        flash('Roblox removal queued', 'info')
     
     member.is_active = False
     member.last_updated = datetime.utcnow()
@@ -146,14 +144,8 @@ def delete_member(member_id):
 @staff_required
 def promote_member():
     """Promote a member and record a PromotionLog"""
-    # Get available ranks from RankMapping, or use default list
-    rank_mappings = RankMapping.query.filter_by(is_active=True).order_by(RankMapping.system_rank).all()
-    if rank_mappings:
-        available_ranks = [mapping.system_rank for mapping in rank_mappings]
-    else:
-        # Fallback to default ranks if no mappings exist
-        available_ranks = ['Aspirant', 'Novice', 'Adept', 'Crusader', 'Paladin', 
-                          'Exemplar', 'Prospect', 'Commander', 'Marshal', 'General', 'Chief General']
+    # Active mapped ranks (cached), or the default list if none are mapped
+    available_ranks = get_active_ranks()
     
     if request.method == 'POST':
         member_id = request.form.get('member_id', type=int)
@@ -189,14 +181,9 @@ def promote_member():
         current_app.logger.info(f"Promote member: sync_enabled={sync_enabled}, has_roblox_id={has_roblox_id}, rank: {old_rank} -> {new_rank}")
         
         if sync_enabled and has_roblox_id:
-            current_app.logger.info(f"Syncing {member.discord_username} promotion: {old_rank} -> {new_rank}")
-            result = sync_member_to_roblox(member)
-            if not result['success']:
-                error_msg = f"Promotion saved, but Roblox sync failed: {result['message']}"
-                current_app.logger.error(error_msg)
-                flash(error_msg, 'warning')
-            else:
-                current_app.logger.info(f"Successfully synced {member.discord_username} promotion to Roblox")
+            current_app.logger.info(f"Queueing {member.discord_username} promotion sync: {old_rank} -> {new_rank}")
+            enqueue_member_sync(member.id, 'update')
+            flash('Roblox sync queued', 'info')
         elif sync_enabled and not has_roblox_id:
             current_app.logger.warning(f"Cannot sync {member.discord_username} - no Roblox ID set")
             flash('Promotion saved, but cannot sync to Roblox (no Roblox ID)', 'warning')
@@ -215,7 +202,7 @@ def promote_member():
 def stats():
     """Member Statistics Dashboard"""
     from utils.stats_logger import get_stats_history
-    import json
+    json = current_app.json
     
     # Get last 30 days of history
     data = get_stats_history(days=30)
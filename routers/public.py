@@ -1,23 +1,100 @@
-from flask import Blueprint, render_template, request
-from database.models import Member
-from database.ac_models import ActivityEntry
+from flask import Blueprint, render_template, request, session, make_response, current_app
+from database.models import db, Member, strict_load
+from database.ac_models import ActivityEntry, ACTIVITY_TYPES
+from routers.ac import get_current_period, get_ac_dashboard_data, period_data_version, period_page_version
+from utils.auth import is_staff
+from utils.cache import cache
+from sqlalchemy import func
+from functools import lru_cache
+import hashlib
+import os
 
 public_bp = Blueprint('public', __name__)
 
 
+PUBLIC_ROSTER_CACHE_TIMEOUT = 300
+
+
+def _roster_version():
+    """Member row count and latest last_updated; any add, edit or removal changes it"""
+    count, last_updated = db.session.query(func.count(Member.id), func.max(Member.last_updated)).one()
+    return f"{count}:{last_updated}"
+
+
+@lru_cache(maxsize=1)
+def _build_id():
+    """
+    Deploy identifier for page ETags: BUILD_ID from config, else the newest
+    mtime under templates/ and routers/, so a deploy invalidates old pages.
+    """
+    build_id = current_app.config.get('BUILD_ID')
+    if build_id:
+        return build_id
+    roots = (os.path.join(current_app.root_path, current_app.template_folder), os.path.dirname(__file__))
+    return str(max(
+        os.path.getmtime(os.path.join(dirpath, name))
+        for root in roots
+        for dirpath, _, names in os.walk(root)
+        for name in names
+    ))
+
+
+def _page_etag(version):
+    """
+    ETag for a public page: the build, its data version, the URL (search
+    included) and whether the viewer sees staff links. None while flashed
+    messages are pending, since those must be rendered (and consumed) by a
+    full response.
+    """
+    if session.get('_flashes'):
+        return None
+    return hashlib.sha1(f"{_build_id()}:{version}:{request.full_path}:{is_staff()}".encode()).hexdigest()
+
+
+def _not_modified(etag):
+    """304 response if the browser already holds this ETag, else None"""
+    if etag and etag in request.if_none_match:
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def _with_etag(body, etag):
+    """Response for a rendered page; revalidated on every visit when it has an ETag"""
+    response = make_response(body)
+    if etag:
+        response.set_etag(etag)
+        # Pages differ per session (staff links), so only the browser may keep them
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @public_bp.route('/')
 def public_roster():
     search = request.args.get('search', '')
-    query = Member.query.filter_by(is_active=True)
-    if search:
-        s = f"%{search}%"
-        query = query.filter(
-            (Member.discord_username.ilike(s)) |
-            (Member.roblox_username.ilike(s)) |
-            (Member.current_rank.ilike(s))
-        )
-    members = query.order_by(Member.current_rank, Member.discord_username).all()
-    return render_template('public_roster.html', members=members, search=search)
+    version = _roster_version()
+    etag = _page_etag(version)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    # Only the member rows are cached, not the page: the template also
+    # shows flashed messages and staff-only links for the current session
+    cache_key = f"roster:{version}:{search}"
+    members = cache.get(cache_key)
+    if members is None:
+        query = db.session.query(
+            Member.id, Member.discord_username, Member.roblox_username, Member.current_rank
+        ).filter(Member.is_active == True)
+        if search:
+            query = query.filter(Member.search_filter(search))
+        members = [
+            row._asdict()
+            for row in query.order_by(Member.current_rank, Member.discord_username)
+        ]
+        cache.set(cache_key, members, timeout=PUBLIC_ROSTER_CACHE_TIMEOUT)
+    return _with_etag(render_template('public_roster.html', members=members, search=search), etag)
 
 
 @public_bp.route('/public/member/<int:member_id>')
@@ -25,7 +102,7 @@ def public_member(member_id):
     """Public read-only member view (limited data)"""
     member = Member.query.get_or_404(member_id)
     # limit data for public view: basic profile + recent non-sensitive activities
-    recent_activities = ActivityEntry.query.filter_by(member_id=member_id).order_by(ActivityEntry.activity_date.desc()).limit(5).all()
+    recent_activities = ActivityEntry.query.options(*strict_load()).filter_by(member_id=member_id).order_by(ActivityEntry.activity_date.desc()).limit(5).all()
     # do not include internal IA notices or editable controls
     return render_template('public_member.html',
                            member=member,
@@ -34,14 +111,7 @@ def public_member(member_id):
 
 @public_bp.route('/ac_progress')
 def public_ac_progress():
-    from database.models import db
-    from database.ac_models import (
-        ACPeriod, ActivityEntry, InactivityNotice, ACExemption,
-        ACTIVITY_TYPES, AC_QUOTAS, get_member_quota
-    )
-    from sqlalchemy import func
-
-    current_period = ACPeriod.query.filter_by(is_active=True).first()
+    current_period = get_current_period()
     # If no period, we can just render the page with empty data or a message
     if not current_period:
         return render_template('public_ac_progress.html', 
@@ -49,77 +119,18 @@ def public_ac_progress():
                              member_progress=[],
                              activity_types=ACTIVITY_TYPES)
 
-    # Helper query for members with quota (duplicated from ac.py to avoid circular imports/complexity)
-    excluded = {'general', 'chief general'}
-    allowed = [r.lower() for r, q in AC_QUOTAS.items() if q and q > 0 and r.lower() not in excluded]
-    members = Member.query.filter(
-        Member.is_active == True,
-        func.lower(Member.current_rank).in_(allowed)
-    ).order_by(func.lower(Member.current_rank), Member.discord_username).all()
-
-    member_progress = []
-    for m in members:
-        quota = get_member_quota(m.current_rank) or 0
-        if not quota:
-            continue
-
-        # Get member's activity summary
-        member_activities = db.session.query(
-            ActivityEntry.activity_type,
-            db.func.count(ActivityEntry.id),
-            db.func.sum(ActivityEntry.points)
-        ).filter_by(
-            member_id=m.id,
-            ac_period_id=current_period.id
-        ).group_by(ActivityEntry.activity_type).all()
-
-        activity_summary = {
-            type_: {'count': count, 'points': float(points or 0)}
-            for type_, count, points in member_activities
-        }
-
-        total_points = sum(stat['points'] for stat in activity_summary.values())
-        
-        ia_notice = InactivityNotice.query.filter_by(
-            member_id=m.id,
-            ac_period_id=current_period.id
-        ).first()
-
-        exemption = ACExemption.query.filter_by(
-            member_id=m.id,
-            ac_period_id=current_period.id
-        ).first()
-
-        # Determine status and percentage
-        if exemption:
-            status = 'Exempt'
-            pct = 100.0
-        elif ia_notice:
-            status = 'Protected (IA)'
-            pct = 100.0
-        elif total_points >= quota:
-            status = 'Passed'
-            pct = min(100.0, (total_points / quota) * 100.0) if quota > 0 else 0.0
-        else:
-            status = 'In Progress'
-            pct = min(100.0, (total_points / quota) * 100.0) if quota > 0 else 0.0
-
-        progress = {
-            'member': m,
-            'quota': quota,
-            'points': total_points,
-            'percentage': pct,
-            'status': status,
-            'is_protected': bool(ia_notice),
-            'is_exempt': bool(exemption),
-            'activity_summary': activity_summary
-        }
-        member_progress.append(progress)
-
-    # Sort: Exempt first, then IA protected, then by percentage
-    member_progress.sort(key=lambda x: (100 if x['is_exempt'] else (99 if x['is_protected'] else x['percentage'])))
-
-    return render_template('public_ac_progress.html',
-                         current_period=current_period,
-                         member_progress=member_progress,
-                         activity_types=ACTIVITY_TYPES)
+    # The page shows the period name, so its ETag covers name and dates too
+    data_version = period_data_version(current_period)
+    etag = _page_etag(period_page_version(current_period, data_version))
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    # Same per-member progress as the HCT dashboard (already in display order:
+    # by percentage, IA and Exempt last), shared through its versioned cache
+    member_progress = get_ac_dashboard_data(current_period, data_version)['member_progress']
+
+    return _with_etag(render_template('public_ac_progress.html',
+                                      current_period=current_period,
+                                      member_progress=member_progress,
+                                      activity_types=ACTIVITY_TYPES), etag)
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app
 from database.models import db, RankMapping
 from utils.auth import staff_required
+from utils.rank_cache import invalidate_active_ranks
 from utils.roblox_sync import sync_from_roblox
 from datetime import datetime
 
@@ -45,20 +46,24 @@ def manage_rank_mappings():
         elif action == 'delete':
             mapping_id = request.form.get('mapping_id', type=int)
             if mapping_id:
-                mapping = RankMapping.query.get(mapping_id)
-                if mapping:
-                    db.session.delete(mapping)
-                    db.session.commit()
+                # Single DELETE by id, no row fetch
+                deleted = RankMapping.query.filter_by(id=mapping_id).delete(synchronize_session=False)
+                db.session.commit()
+                if deleted:
+                    invalidate_active_ranks()
                     flash('Mapping deleted', 'success')
         
         elif action == 'toggle':
             mapping_id = request.form.get('mapping_id', type=int)
             if mapping_id:
-                mapping = RankMapping.query.get(mapping_id)
-                if mapping:
-                    mapping.is_active = not mapping.is_active
-                    mapping.last_updated = datetime.utcnow()
-                    db.session.commit()
+                # Flip is_active in one UPDATE, no row fetch
+                updated = RankMapping.query.filter_by(id=mapping_id).update({
+                    'is_active': db.not_(RankMapping.is_active),
+                    'last_updated': datetime.utcnow()
+                }, synchronize_session=False)
+                db.session.commit()
+                if updated:
+                    invalidate_active_ranks()
                     flash('Mapping updated', 'success')
         
         return redirect(url_for('sync.manage_rank_mappings'))
@@ -3,6 +3,7 @@ Quick script to run the app accessible on your local network.
 Share the IP address shown with your teammates.
 """
 import socket
+from waitress import serve
 from app import app
 
 def get_local_ip():
@@ -32,6 +33,8 @@ if __name__ == '__main__':
     print("=" * 60)
     print()
     
-    app.run(host='0.0.0.0', port=port, debug=True)
+    # Waitress instead of the Flask dev server: a thread pool serves several
+    # teammates at once, and there is no debug reloader. Runs on Windows too.
+    serve(app, host='0.0.0.0', port=port, threads=16, channel_timeout=120)
 
 
@@ -1,7 +1,7 @@
-from app import create_app
 import time
 
-app = create_app()
+# Importing app builds the shared instance, which starts the scheduler when enabled
+from app import app
 
 if __name__ == "__main__":
     print("🚀 Starting Background Scheduler Service...")
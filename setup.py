@@ -19,10 +19,9 @@ def setup_database():
     db_uri = f"sqlite:///{db_file.replace('\\', '/')}"
 
     # Import app after setting up folders to avoid DB-open on import problems
-    from app import create_app
+    from app import app
     from database.models import db
 
-    app = create_app()
     # override configured DB URI with instance path for setup
     app.config['SQLALCHEMY_DATABASE_URI'] = db_uri
 
@@ -45,21 +44,19 @@ def setup_database():
 
 def create_sample_data():
     """Optional: create sample data"""
-    from app import create_app
-    app = create_app()
+    from app import app
     with app.app_context():
-        from database.models import db, Member, ActivityLog
-        from datetime import datetime
-        if Member.query.count() > 0:
+        from database.models import db, Member
+        if db.session.scalar(db.select(Member.id).limit(1)) is not None:
             print("Sample data exists, skipping.")
             return
         sample_members = [
-            Member(discord_username="Commander_Alpha", roblox_username="AlphaLeader", current_rank="Commander"),
-            Member(discord_username="Marshall_Beta", roblox_username="BetaMarshall", current_rank="Marshall"),
-            Member(discord_username="Aspirant_Gamma", roblox_username="GammaNewbie", current_rank="Aspirant"),
+            {'discord_username': "Commander_Alpha", 'roblox_username': "AlphaLeader", 'current_rank': "Commander"},
+            {'discord_username': "Marshal_Beta", 'roblox_username': "BetaMarshal", 'current_rank': "Marshal"},
+            {'discord_username': "Aspirant_Gamma", 'roblox_username': "GammaNewbie", 'current_rank': "Aspirant"},
         ]
-        for m in sample_members:
-            db.session.add(m)
+        # One executemany INSERT in a single transaction, no per-object unit-of-work bookkeeping
+        db.session.execute(db.insert(Member), sample_members)
         db.session.commit()
         print("✅ Sample members created")
 
@@ -7,4 +7,4 @@ python run_scheduler.py &
 
 # Start the web application in the foreground
 echo "🌐 Starting Web Application..."
-exec gunicorn --bind 0.0.0.0:5000 --workers 2 app:app
+exec gunicorn --bind 0.0.0.0:5000 --workers 2 --worker-class gthread --threads 8 app:app
@@ -1,8 +1,30 @@
-from app import create_app
-from database.models import db
+from app import app
+from database.models import db, Member, RankMapping
+from database.ac_models import MemberACSummary
+from utils.rank_cache import invalidate_active_ranks
 
-app = create_app()
 with app.app_context():
     print("🔄 Updating database schema...")
     db.create_all()
+    # create_all() skips tables that already exist, so add any newly
+    # declared indexes to existing tables as well.
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+    # Superseded by ix_ae_period_member_type, which has the same prefix
+    db.session.execute(db.text('DROP INDEX IF EXISTS ix_ae_period_member'))
+    # Older syncs stored the Roblox spelling, which has no AC quota
+    Member.query.filter_by(current_rank='Marshall').update({'current_rank': 'Marshal'})
+    # Rank mappings too, or Roblox pushes for Marshals find no role and pulls
+    # write 'Marshall' back; system_rank is unique, so an existing 'Marshal'
+    # mapping wins over the old spelling
+    if db.session.scalar(db.select(RankMapping.id).filter_by(system_rank='Marshal')) is not None:
+        RankMapping.query.filter_by(system_rank='Marshall').delete()
+    else:
+        RankMapping.query.filter_by(system_rank='Marshall').update({'system_rank': 'Marshal'})
+    # Backfill per-period point totals from existing activity entries
+    MemberACSummary.rebuild()
+    db.session.commit()
+    # Bulk statements skip mapper events, so drop the cached rank list by hand
+    invalidate_active_ranks()
     print("✅ Database schema updated.")
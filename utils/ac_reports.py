@@ -3,9 +3,59 @@ AC Report Generation and Title Rewards Calculator
 Generates Excel reports and calculates title rewards automatically
 """
 
+from collections import Counter
 from datetime import datetime
 from typing import Dict, List, Optional
+import csv
 import io
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+    _HAS_OPENPYXL = True
+
+    # Style parts shared by every report's named styles
+    _CENTER = Alignment(horizontal='center')
+    _TITLE_FONT = Font(size=16, bold=True)
+    _BOLD_FONT = Font(bold=True)
+    _HEADER_FONT = Font(color="FFFFFF", bold=True)
+    _HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    _PROTECTED_FILL = PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid")  # Light blue
+    _PASSED_FILL = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Light green
+    _FAILED_FILL = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")  # Light red
+except ImportError:  # Excel export is optional; CSV and titles still work
+    _HAS_OPENPYXL = False
+
+# Shared webhook session: keeps the TLS connection to Discord alive between
+# sends. Retries cover connection failures; POSTs are not replayed on 5xx.
+_WEBHOOK_SESSION = requests.Session()
+_WEBHOOK_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504))
+))
+
+# Titles each activity type counts towards (Host with the Most = Training + Raid + Patrol)
+_REPORT_TITLES_BY_TYPE = {
+    'Raid': ('Host with the Most', 'Legionnaire'),
+    'Patrol': ('Host with the Most',),
+    'Training': ('Host with the Most',),
+    'Mission': ('Taskmaster',),
+    'Tryout': ('Scout',),
+}
+
+_TITLE_REQUIREMENTS = {
+    'Host with the Most': '5+ events hosted (Training + Raid + Patrol)',
+    'Taskmaster': '5+ missions posted',
+    'Legionnaire': '5+ raids hosted',
+    'Scout': '5+ tryouts hosted',
+}
+
+TITLE_MIN_COUNT = 5
 
 class ACReportGenerator:
     """Generates AC reports and calculates title rewards"""
@@ -16,107 +66,90 @@ class ACReportGenerator:
         self.title_winners = {}
         
     def generate_excel_report(self) -> io.BytesIO:
-        """Generate Excel report for AC period"""
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        except ImportError:
+        """Generate Excel report for AC period (streamed through a write-only workbook)"""
+        if not _HAS_OPENPYXL:
             raise ImportError("openpyxl is required for Excel reports. Install with: pip install openpyxl")
         
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "AC Report"
-        
-        # Title
-        ws.merge_cells('A1:G1')
-        title_cell = ws['A1']
-        title_cell.value = f"Activity Check Report - {self.ac_period.period_name}"
-        title_cell.font = Font(size=16, bold=True)
-        title_cell.alignment = Alignment(horizontal='center')
-        
-        # Period info
-        ws.merge_cells('A2:G2')
-        period_cell = ws['A2']
-        period_cell.value = f"{self.ac_period.start_date.strftime('%B %d, %Y')} - {self.ac_period.end_date.strftime('%B %d, %Y')}"
-        period_cell.alignment = Alignment(horizontal='center')
+        # Write-only workbook: rows are serialised as they are appended instead of
+        # keeping a Cell object per value, so styles are registered once up front
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("AC Report")
+        
+        wb.add_named_style(NamedStyle(name='ac_title', font=_TITLE_FONT, alignment=_CENTER))
+        wb.add_named_style(NamedStyle(name='ac_centered', alignment=_CENTER))
+        wb.add_named_style(NamedStyle(name='ac_header', font=_HEADER_FONT, fill=_HEADER_FILL, alignment=_CENTER))
+        wb.add_named_style(NamedStyle(name='ac_bold', font=_BOLD_FONT))
+        for name, fill in (('ac_protected', _PROTECTED_FILL),
+                           ('ac_passed', _PASSED_FILL),
+                           ('ac_failed', _FAILED_FILL)):
+            wb.add_named_style(NamedStyle(name=name, fill=fill, alignment=_CENTER))
+        
+        def styled(value, style):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            return cell
+        
+        # Column widths must be set before the first row is written
+        for column, width in zip('ABCDEFG', (20, 15, 10, 12, 15, 12, 30)):
+            ws.column_dimensions[column].width = width
+        
+        # Title and period info (merged ranges are not available in write-only mode)
+        ws.append([styled(f"Activity Check Report - {self.ac_period.period_name}", 'ac_title')])
+        ws.append([styled(
+            f"{self.ac_period.start_date.strftime('%B %d, %Y')} - {self.ac_period.end_date.strftime('%B %d, %Y')}",
+            'ac_centered'
+        )])
         
         # Headers
         headers = ['Discord Username', 'Rank', 'Quota', 'Points Earned', 'Status', 'Activities', 'Notes']
         ws.append([])  # Empty row
-        ws.append(headers)
-        
-        # Style headers
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
-        
-        for col in range(1, len(headers) + 1):
-            cell = ws.cell(row=4, column=col)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
+        ws.append([styled(header, 'ac_header') for header in headers])
         
         # Data rows
-        row_num = 5
-        for progress in sorted(self.members_progress, key=lambda x: x['member'].discord_username):
+        passed = failed = protected = 0
+        rows = sorted(self.members_progress, key=lambda x: x['member'].discord_username)
+        for progress in rows:
             member = progress['member']
+            points = progress['points']
+            quota = progress['quota']
             
-            # Determine status
+            # Determine status (summary counts are tallied in the same pass)
             if progress['is_protected']:
-                status = "PROTECTED (IA)"
-                status_color = "ADD8E6"  # Light blue
-            elif progress['points'] >= progress['quota']:
-                status = "PASSED"
-                status_color = "90EE90"  # Light green
+                status_cell = styled("PROTECTED (IA)", 'ac_protected')
+                protected += 1
+            elif points >= quota:
+                status_cell = styled("PASSED", 'ac_passed')
+                passed += 1
             else:
-                status = "FAILED"
-                status_color = "FFB6C1"  # Light red
+                status_cell = styled("FAILED", 'ac_failed')
+                failed += 1
             
             # Get activity breakdown
-            activities_text = self._get_activity_breakdown(progress['recent_activities'])
+            activities = progress['recent_activities']
+            activity_count = len(activities)
+            activities_text = self._get_activity_breakdown(activities)
             
-            # Add row
             ws.append([
                 member.discord_username,
                 member.current_rank,
-                progress['quota'],
-                round(progress['points'], 1),
-                status,
-                len(progress['recent_activities']),
+                quota,
+                round(points, 1),
+                status_cell,
+                activity_count,
                 progress.get('notes', '')
             ])
-            
-            # Style status cell
-            status_cell = ws.cell(row=row_num, column=5)
-            status_cell.fill = PatternFill(start_color=status_color, end_color=status_color, fill_type="solid")
-            status_cell.alignment = Alignment(horizontal='center')
-            
-            row_num += 1
         
         # Summary statistics
         ws.append([])
-        ws.append(['SUMMARY'])
-        ws.cell(row=row_num + 1, column=1).font = Font(bold=True)
+        ws.append([styled('SUMMARY', 'ac_bold')])
         
-        total = len(self.members_progress)
-        passed = sum(1 for p in self.members_progress if not p['is_protected'] and p['points'] >= p['quota'])
-        failed = sum(1 for p in self.members_progress if not p['is_protected'] and p['points'] < p['quota'])
-        protected = sum(1 for p in self.members_progress if p['is_protected'])
+        total = len(rows)
         
         ws.append(['Total Members:', total])
         ws.append(['Passed:', passed])
         ws.append(['Failed:', failed])
         ws.append(['Protected (IA):', protected])
         
-        # Adjust column widths
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 10
-        ws.column_dimensions['D'].width = 12
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 12
-        ws.column_dimensions['G'].width = 30
-        
         # Save to BytesIO
         output = io.BytesIO()
         wb.save(output)
@@ -126,12 +159,8 @@ class ACReportGenerator:
     
     def _get_activity_breakdown(self, activities) -> str:
         """Get activity breakdown as text"""
-        activity_counts = {}
-        for activity in activities:
-            activity_type = activity.activity_type
-            activity_counts[activity_type] = activity_counts.get(activity_type, 0) + 1
-        
-        return ", ".join([f"{k}: {v}" for k, v in activity_counts.items()])
+        activity_counts = Counter(activity.activity_type for activity in activities)
+        return ", ".join(f"{k}: {v}" for k, v in activity_counts.items())
     
     def calculate_title_rewards(self, all_activities) -> Dict[str, Dict]:
         """
@@ -145,91 +174,39 @@ class ACReportGenerator:
         - Executor: Excluded (requires mission completion tracking)
         """
         
-        # Count activities by type for each member
-        member_stats = {}
+        # Single pass: bump each title counter the activity feeds and track the
+        # running leader inline instead of scanning every member afterwards.
+        # Ties go to the member whose first activity comes earliest.
+        counts = {}
+        first_seen = {}  # member_id -> order of the member's first activity
+        leaders = {}  # title -> (count, member_id, member_name)
+        titles_for = _REPORT_TITLES_BY_TYPE.get
         
         for activity in all_activities:
             member_id = activity.member_id
-            member_name = activity.member.discord_username
-            activity_type = activity.activity_type
-            
-            if member_id not in member_stats:
-                member_stats[member_id] = {
-                    'name': member_name,
-                    'events': 0,  # Training + Raid + Patrol for HWTM
-                    'missions': 0,
-                    'raids': 0,
-                    'patrols': 0,
-                    'tryouts': 0,
-                    'total': 0
-                }
-            
-            member_stats[member_id]['total'] += 1
+            order = first_seen.setdefault(member_id, len(first_seen))
+            activity_titles = titles_for(activity.activity_type)
+            if activity_titles is None:
+                continue
             
-            # Track specific activity types
-            if activity_type == 'Raid':
-                member_stats[member_id]['raids'] += 1
-                member_stats[member_id]['events'] += 1  # Events = Training + Raid + Patrol
-            elif activity_type == 'Patrol':
-                member_stats[member_id]['patrols'] += 1
-                member_stats[member_id]['events'] += 1  # Events = Training + Raid + Patrol
-            elif activity_type == 'Training':
-                member_stats[member_id]['events'] += 1  # Events = Training + Raid + Patrol
-            elif activity_type == 'Mission':
-                member_stats[member_id]['missions'] += 1
-            elif activity_type == 'Tryout':
-                member_stats[member_id]['tryouts'] += 1
+            for title in activity_titles:
+                key = (title, member_id)
+                count = counts[key] = counts.get(key, 0) + 1
+                leader = leaders.get(title)
+                if (leader is None or count > leader[0]
+                        or (count == leader[0] and order < first_seen[leader[1]])):
+                    leaders[title] = (count, member_id, activity.member.discord_username)
         
         # Calculate winners
         titles = {}
-        
-        # Host with the Most (most events = Training + Raid + Patrol, min 5)
-        event_leaders = [(mid, stats['events'], stats['name']) 
-                        for mid, stats in member_stats.items() 
-                        if stats['events'] >= 5]
-        if event_leaders:
-            winner = max(event_leaders, key=lambda x: x[1])
-            titles['Host with the Most'] = {
-                'winner': winner[2],
-                'count': winner[1],
-                'requirement': '5+ events hosted (Training + Raid + Patrol)'
-            }
-        
-        # Taskmaster (most missions, min 5)
-        mission_leaders = [(mid, stats['missions'], stats['name']) 
-                          for mid, stats in member_stats.items() 
-                          if stats['missions'] >= 5]
-        if mission_leaders:
-            winner = max(mission_leaders, key=lambda x: x[1])
-            titles['Taskmaster'] = {
-                'winner': winner[2],
-                'count': winner[1],
-                'requirement': '5+ missions posted'
-            }
-        
-        # Legionnaire (most raids, min 5)
-        raid_leaders = [(mid, stats['raids'], stats['name']) 
-                       for mid, stats in member_stats.items() 
-                       if stats['raids'] >= 5]
-        if raid_leaders:
-            winner = max(raid_leaders, key=lambda x: x[1])
-            titles['Legionnaire'] = {
-                'winner': winner[2],
-                'count': winner[1],
-                'requirement': '5+ raids hosted'
-            }
-        
-        # Scout (most tryouts, min 5)
-        tryout_leaders = [(mid, stats['tryouts'], stats['name']) 
-                         for mid, stats in member_stats.items() 
-                         if stats['tryouts'] >= 5]
-        if tryout_leaders:
-            winner = max(tryout_leaders, key=lambda x: x[1])
-            titles['Scout'] = {
-                'winner': winner[2],
-                'count': winner[1],
-                'requirement': '5+ tryouts hosted'
-            }
+        for title, requirement in _TITLE_REQUIREMENTS.items():
+            leader = leaders.get(title)
+            if leader and leader[0] >= TITLE_MIN_COUNT:
+                titles[title] = {
+                    'winner': leader[2],
+                    'count': leader[0],
+                    'requirement': requirement
+                }
         
         # Executor is excluded (requires mission completion tracking)
         
@@ -255,9 +232,6 @@ class ACReportGenerator:
     
     def generate_csv_report(self) -> str:
         """Generate CSV report as string"""
-        import csv
-        import io
-        
         output = io.StringIO()
         writer = csv.writer(output)
         
@@ -269,16 +243,21 @@ class ACReportGenerator:
         # Column headers
         writer.writerow(['Discord Username', 'Rank', 'Quota', 'Points Earned', 'Status', 'Total Activities'])
         
-        # Data
-        for progress in sorted(self.members_progress, key=lambda x: x['member'].discord_username):
+        # Data (summary counts are tallied in the same pass)
+        passed = failed = protected = 0
+        rows = sorted(self.members_progress, key=lambda x: x['member'].discord_username)
+        for progress in rows:
             member = progress['member']
             
             if progress['is_protected']:
                 status = "PROTECTED (IA)"
+                protected += 1
             elif progress['points'] >= progress['quota']:
                 status = "PASSED"
+                passed += 1
             else:
                 status = "FAILED"
+                failed += 1
             
             writer.writerow([
                 member.discord_username,
@@ -292,10 +271,7 @@ class ACReportGenerator:
         # Summary
         writer.writerow([])
         writer.writerow(['SUMMARY'])
-        total = len(self.members_progress)
-        passed = sum(1 for p in self.members_progress if not p['is_protected'] and p['points'] >= p['quota'])
-        failed = sum(1 for p in self.members_progress if not p['is_protected'] and p['points'] < p['quota'])
-        protected = sum(1 for p in self.members_progress if p['is_protected'])
+        total = len(rows)
         
         writer.writerow(['Total Members', total])
         writer.writerow(['Passed', passed])
@@ -307,9 +283,6 @@ class ACReportGenerator:
 
 def send_discord_webhook(webhook_url: str, message: str, title: str = "Title Rewards") -> bool:
     """Send title rewards to Discord webhook"""
-    import requests
-    import json
-    
     if not webhook_url:
         return False
     
@@ -329,12 +302,7 @@ def send_discord_webhook(webhook_url: str, message: str, title: str = "Title Rew
     }
     
     try:
-        response = requests.post(
-            webhook_url,
-            data=json.dumps(payload),
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
+        response = _WEBHOOK_SESSION.post(webhook_url, json=payload, timeout=10)
         return response.status_code == 204
     except Exception as e:
         print(f"Failed to send webhook: {e}")
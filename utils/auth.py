@@ -9,23 +9,19 @@ from flask import session, redirect, url_for, flash, current_app, request, jsoni
 import secrets
 import os
 
+def _matches(password, expected):
+    """Constant-time compare on UTF-8 bytes (str compare_digest rejects non-ASCII input)"""
+    if not password or not expected:
+        return False
+    return secrets.compare_digest(str(password).encode(), str(expected).encode())
+
 def check_password(password):
     """Securely check if provided password matches configured staff password"""
-    if not password:
-        return False
-    return secrets.compare_digest(
-        str(password),
-        str(current_app.config.get('STAFF_PASSWORD', ''))
-    )
+    return _matches(password, current_app.config.get('STAFF_PASSWORD', ''))
 
 def check_hct_password(password):
     """Securely check if provided password matches configured HCT password"""
-    if not password:
-        return False
-    return secrets.compare_digest(
-        str(password),
-        str(os.getenv('HCT_PASSWORD', ''))
-    )
+    return _matches(password, os.getenv('HCT_PASSWORD', ''))
 
 def is_staff():
     """Check if current session is authenticated as staff"""
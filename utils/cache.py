@@ -0,0 +1,8 @@
+"""
+Shared Flask-Caching instance for the Taskforce Management System
+Bound to the app in create_app(); backend is chosen by CACHE_TYPE
+"""
+
+from flask_caching import Cache
+
+cache = Cache()
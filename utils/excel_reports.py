@@ -1,80 +1,67 @@
-from io import BytesIO
-from typing import List, Dict
+from collections import defaultdict
+from tempfile import SpooledTemporaryFile
+from typing import IO, List, Dict
 from datetime import datetime
 from openpyxl import Workbook, load_workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from database.models import Member
-from database.ac_models import ACPeriod, ActivityEntry, InactivityNotice, ACExemption, get_member_quota
+from database.ac_models import ACPeriod, ActivityEntry, InactivityNotice, ACExemption, MemberACSummary, get_member_quota
 from sqlalchemy import func
 
-def _gather_ac_rows(period: ACPeriod) -> List[List]:
-    """Return list of rows (including header) for the AC period"""
-    header = [
-        "Rank",
-        "Discord Username",
-        "Roblox Username",
-        "Quota",
-        "Points",
-        "Percentage",
-        "Status",
-        "Protected (IA)",
-        "Exempt",
-        "Recent Activities"
-    ]
-    rows = [header]
+# Shared cell styles: built once at import instead of once per cell/row
+_PURPLE_FILL = PatternFill(start_color="4B0082", end_color="4B0082", fill_type="solid")
+_LIGHT_GREY_FILL = PatternFill(start_color="E8E8E8", end_color="E8E8E8", fill_type="solid")
+_WHITE_FILL = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
+_WHITE_BOLD_FONT = Font(color="FFFFFF", bold=True, size=11)
+_BOLD_FONT = Font(bold=True)
+_CENTER = Alignment(horizontal='center', vertical='center')
+_LEFT = Alignment(horizontal='left', vertical='center')
+_THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
 
-    if not period:
-        return rows
-
-    # Query members with quota
-    members = Member.query.filter(Member.is_active == True).order_by(Member.current_rank, Member.discord_username).all()
-    for m in members:
-        quota = get_member_quota(m.current_rank) or 0
-        if quota == 0:
-            # skip ranks with no quota
-            continue
-
-        total_points = (
-            ActivityEntry.query.with_entities(
-                ActivityEntry.points
-            )
-            .filter(ActivityEntry.member_id == m.id, ActivityEntry.ac_period_id == period.id)
-            .all()
-        )
-        total_points = sum(p[0] for p in total_points) if total_points else 0.0
-
-        ia = InactivityNotice.query.filter_by(member_id=m.id, ac_period_id=period.id, protects_ac=True).first()
-        exemption = ACExemption.query.filter_by(member_id=m.id, ac_period_id=period.id).first()
-        recent_acts = ActivityEntry.query.filter_by(member_id=m.id, ac_period_id=period.id).order_by(ActivityEntry.activity_date.desc()).limit(5).all()
-        recent_str = "; ".join(f"{a.activity_date.strftime('%Y-%m-%d')}:{a.activity_type}({a.points})" for a in recent_acts)
-
-        pct = round(min(100.0, (total_points / quota) * 100.0), 2) if quota else 0.0
-        
-        # Determine status: Exempt takes priority, then IA, then points
-        if exemption:
-            status = "Exempt"
-        elif ia:
-            status = "Protected (IA)"
-        elif total_points >= quota:
-            status = "Passed"
-        else:
-            status = "In Progress"
+# Status colors
+_STATUS_FILLS = {
+    "Passed": PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid"),  # Light green
+    "Failed": PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid"),  # Light red
+    "Inactivity": PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid"),  # Light blue
+    "Excused": PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid"),  # Yellow
+    "Protected (IA)": PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid"),
+    "Exempt": PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid"),
+    "In Progress": PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")
+}
 
-        rows.append([
-            m.current_rank,
-            m.discord_username,
-            m.roblox_username or "",
-            quota,
-            total_points,
-            pct,
-            status,
-            "Yes" if ia else "No",
-            "Yes" if exemption else "No",
-            recent_str
-        ])
+def _period_status_sets(period: ACPeriod):
+    """Member ids with an AC-protecting IA notice, and with an exemption, in a period"""
+    protected = {
+        member_id for (member_id,) in
+        InactivityNotice.query.with_entities(InactivityNotice.member_id)
+        .filter_by(ac_period_id=period.id, protects_ac=True)
+    }
+    exempt = {
+        member_id for (member_id,) in
+        ACExemption.query.with_entities(ACExemption.member_id)
+        .filter_by(ac_period_id=period.id)
+    }
+    return protected, exempt
 
-    return rows
+# Header of the plain sheet written when there is no AC period to lay out
+_FALLBACK_HEADER = [
+    "Rank",
+    "Discord Username",
+    "Roblox Username",
+    "Quota",
+    "Points",
+    "Percentage",
+    "Status",
+    "Protected (IA)",
+    "Exempt",
+    "Recent Activities"
+]
 
 def _gather_ac_data_by_rank(period: ACPeriod) -> Dict[str, List]:
     """Gather AC data organized by rank"""
@@ -82,6 +69,15 @@ def _gather_ac_data_by_rank(period: ACPeriod) -> Dict[str, List]:
         return {}
     
     data_by_rank = {}
+    points_by_member = MemberACSummary.points_by_member(period.id)
+    protected_ids, exempt_ids = _period_status_sets(period)
+    
+    # Activity counts per member and type for the whole period
+    counts_by_member = defaultdict(dict)
+    for member_id, activity_type, count in ActivityEntry.query.with_entities(
+        ActivityEntry.member_id, ActivityEntry.activity_type, func.count(ActivityEntry.id)
+    ).filter_by(ac_period_id=period.id).group_by(ActivityEntry.member_id, ActivityEntry.activity_type):
+        counts_by_member[member_id][activity_type] = count
     
     # Query members with quota, grouped by rank (exclude Chief General only)
     excluded_ranks = {'chief general'}
@@ -99,21 +95,13 @@ def _gather_ac_data_by_rank(period: ACPeriod) -> Dict[str, List]:
         if rank not in data_by_rank:
             data_by_rank[rank] = []
         
-        total_points = (
-            ActivityEntry.query.with_entities(ActivityEntry.points)
-            .filter(ActivityEntry.member_id == m.id, ActivityEntry.ac_period_id == period.id)
-            .all()
-        )
-        total_points = sum(p[0] for p in total_points) if total_points else 0.0
+        total_points = points_by_member.get(m.id, 0.0)
         
-        ia = InactivityNotice.query.filter_by(member_id=m.id, ac_period_id=period.id, protects_ac=True).first()
-        exemption = ACExemption.query.filter_by(member_id=m.id, ac_period_id=period.id).first()
+        ia = m.id in protected_ids
+        exemption = m.id in exempt_ids
         
         # Get activity breakdown
-        activities = ActivityEntry.query.filter_by(member_id=m.id, ac_period_id=period.id).all()
-        activity_counts = {}
-        for a in activities:
-            activity_counts[a.activity_type] = activity_counts.get(a.activity_type, 0) + 1
+        activity_counts = counts_by_member.get(m.id, {})
         
         pct = round(min(100.0, (total_points / quota) * 100.0), 2) if quota else 0.0
         
@@ -153,31 +141,6 @@ def _write_rows_to_sheet(wb: Workbook, sheet_name: str, rows: List[List], period
 
     ws = wb.create_sheet(title=name)
     
-    # Define styles
-    dark_purple = PatternFill(start_color="4B0082", end_color="4B0082", fill_type="solid")
-    white_font = Font(color="FFFFFF", bold=True, size=11)
-    header_fill = PatternFill(start_color="4B0082", end_color="4B0082", fill_type="solid")
-    light_grey = PatternFill(start_color="E8E8E8", end_color="E8E8E8", fill_type="solid")
-    white_fill = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
-    
-    # Status colors
-    status_colors = {
-        "Passed": PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid"),  # Light green
-        "Failed": PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid"),  # Light red
-        "Inactivity": PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid"),  # Light blue
-        "Excused": PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid"),  # Yellow
-        "Protected (IA)": PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid"),
-        "Exempt": PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid"),
-        "In Progress": PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")
-    }
-    
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
     # If we have period data, use formatted version
     if period:
         data_by_rank = _gather_ac_data_by_rank(period)
@@ -187,8 +150,8 @@ def _write_rows_to_sheet(wb: Workbook, sheet_name: str, rows: List[List], period
         title_cell = ws['A1']
         title_cell.value = f"Staff Team Activity Checks {period.period_name}"
         title_cell.font = Font(size=14, bold=True)
-        title_cell.alignment = Alignment(horizontal='center', vertical='center')
-        title_cell.fill = white_fill
+        title_cell.alignment = _CENTER
+        title_cell.fill = _WHITE_FILL
         
         # Period row (12 columns: A-L)
         ws.merge_cells('A2:L2')
@@ -204,8 +167,8 @@ def _write_rows_to_sheet(wb: Workbook, sheet_name: str, rows: List[List], period
         end_str = f"{ordinal(end_day)} of {period.end_date.strftime('%B')}"
         period_cell.value = f"AC CYCLE: {start_str} --> {end_str}"
         period_cell.font = Font(size=12, bold=True)
-        period_cell.alignment = Alignment(horizontal='center', vertical='center')
-        period_cell.fill = white_fill
+        period_cell.alignment = _CENTER
+        period_cell.fill = _WHITE_FILL
         
         # Headers
         headers = ["Rank", "Username", "Result", "Total", "Tryouts", "Events", "Cancelled", 
@@ -213,10 +176,10 @@ def _write_rows_to_sheet(wb: Workbook, sheet_name: str, rows: List[List], period
         header_row = 3
         for col_idx, header in enumerate(headers, start=1):
             cell = ws.cell(row=header_row, column=col_idx, value=header)
-            cell.fill = header_fill
-            cell.font = white_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
+            cell.fill = _PURPLE_FILL
+            cell.font = _WHITE_BOLD_FONT
+            cell.alignment = _CENTER
+            cell.border = _THIN_BORDER
         
         # Data rows organized by rank
         row_num = 4
@@ -231,10 +194,10 @@ def _write_rows_to_sheet(wb: Workbook, sheet_name: str, rows: List[List], period
             # Rank header row (12 columns: A-L)
             ws.merge_cells(f'A{row_num}:L{row_num}')
             rank_cell = ws.cell(row=row_num, column=1, value=rank)
-            rank_cell.fill = dark_purple
-            rank_cell.font = white_font
-            rank_cell.alignment = Alignment(horizontal='left', vertical='center')
-            rank_cell.border = border
+            rank_cell.fill = _PURPLE_FILL
+            rank_cell.font = _WHITE_BOLD_FONT
+            rank_cell.alignment = _LEFT
+            rank_cell.border = _THIN_BORDER
             row_num += 1
             
             # Member rows
@@ -243,86 +206,86 @@ def _write_rows_to_sheet(wb: Workbook, sheet_name: str, rows: List[List], period
                 activity_counts = member_data['activity_counts']
                 
                 # Determine row color (alternating)
-                row_fill = light_grey if (row_num - header_row) % 2 == 0 else white_fill
+                row_fill = _LIGHT_GREY_FILL if (row_num - header_row) % 2 == 0 else _WHITE_FILL
                 
                 # Rank
                 cell = ws.cell(row=row_num, column=1, value=rank)
                 cell.fill = row_fill
-                cell.border = border
+                cell.border = _THIN_BORDER
                 
                 # Username
                 cell = ws.cell(row=row_num, column=2, value=m.discord_username)
                 cell.fill = row_fill
-                cell.border = border
+                cell.border = _THIN_BORDER
                 
                 # Result (Status) - color coded
                 status = member_data['status']
                 cell = ws.cell(row=row_num, column=3, value=status)
-                cell.fill = status_colors.get(status, white_fill)
-                cell.font = Font(bold=True)
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.fill = _STATUS_FILLS.get(status, _WHITE_FILL)
+                cell.font = _BOLD_FONT
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 # Total (Points)
                 cell = ws.cell(row=row_num, column=4, value=round(member_data['points'], 1))
                 cell.fill = row_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 # Activity counts - map to columns: Tryouts, Events, Cancelled, Evaluations, Supervisions, Missions
                 # Tryouts
                 tryout_count = activity_counts.get('Tryout', 0)
                 cell = ws.cell(row=row_num, column=5, value=tryout_count if tryout_count > 0 else "")
                 cell.fill = row_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 # Events (Raid + Patrol combined)
                 events_count = activity_counts.get('Raid', 0) + activity_counts.get('Patrol', 0)
                 cell = ws.cell(row=row_num, column=6, value=events_count if events_count > 0 else "")
                 cell.fill = row_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 # Cancelled (Canceled Training + Cancelled Tryout)
                 cancelled_count = activity_counts.get('Canceled Training', 0) + activity_counts.get('Cancelled Tryout', 0)
                 cell = ws.cell(row=row_num, column=7, value=cancelled_count if cancelled_count > 0 else "")
                 cell.fill = row_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 # Evaluations
                 eval_count = activity_counts.get('Evaluation', 0)
                 cell = ws.cell(row=row_num, column=8, value=eval_count if eval_count > 0 else "")
                 cell.fill = row_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 # Supervisions
                 super_count = activity_counts.get('Supervision', 0)
                 cell = ws.cell(row=row_num, column=9, value=super_count if super_count > 0 else "")
                 cell.fill = row_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 # Missions
                 mission_count = activity_counts.get('Mission', 0)
                 cell = ws.cell(row=row_num, column=10, value=mission_count if mission_count > 0 else "")
                 cell.fill = row_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 # IA checkbox (Yes/No)
                 cell = ws.cell(row=row_num, column=11, value="✓" if member_data['ia'] else "")
                 cell.fill = row_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 # Excused checkbox (Yes/No)
                 cell = ws.cell(row=row_num, column=12, value="✓" if member_data['exempt'] else "")
                 cell.fill = row_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+                cell.alignment = _CENTER
+                cell.border = _THIN_BORDER
                 
                 row_num += 1
             
@@ -349,10 +312,24 @@ def _write_rows_to_sheet(wb: Workbook, sheet_name: str, rows: List[List], period
             )
             ws.column_dimensions[col].width = min(max(10, max_len + 2), 60)
 
-def generate_ac_workbook_bytes(period_id: int = None) -> (BytesIO, str):
+# Exports stay in memory up to this size, then spill to a temp file
+EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+def _save_workbook(wb: Workbook) -> IO[bytes]:
+    """Save a workbook into a spooled buffer, rewound for sending"""
+    out = SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+    wb.save(out)
+    out.seek(0)
+    return out
+
+def _export_rows(period: ACPeriod) -> List[List]:
+    """Rows for the plain fallback sheet (header only); the period layout gathers its own data"""
+    return [] if period else [list(_FALLBACK_HEADER)]
+
+def generate_ac_workbook_bytes(period_id: int = None) -> (IO[bytes], str):
     """
     Build a new workbook for given AC period_id (or active if None).
-    Returns (BytesIO, filename).
+    Returns (file-like, filename); the file spills to disk past EXPORT_SPOOL_MAX_SIZE.
     """
     if period_id:
         period = ACPeriod.query.get(period_id)
@@ -360,7 +337,7 @@ def generate_ac_workbook_bytes(period_id: int = None) -> (BytesIO, str):
         period = ACPeriod.query.filter_by(is_active=True).first()
 
     period_name = period.period_name if period else f"AC_{datetime.utcnow().strftime('%Y%m%d')}"
-    rows = _gather_ac_rows(period)
+    rows = _export_rows(period)
 
     wb = Workbook()
     # remove default sheet
@@ -368,15 +345,13 @@ def generate_ac_workbook_bytes(period_id: int = None) -> (BytesIO, str):
     wb.remove(default)
     _write_rows_to_sheet(wb, f"AC_{period_name}", rows, period=period)
 
-    out = BytesIO()
-    wb.save(out)
-    out.seek(0)
+    out = _save_workbook(wb)
     filename = f"AC_{period_name}.xlsx"
     return out, filename
 
-def merge_into_uploaded_workbook_bytes(uploaded_file_stream, period_id: int = None) -> (BytesIO, str):
+def merge_into_uploaded_workbook_bytes(uploaded_file_stream, period_id: int = None) -> (IO[bytes], str):
     """
-    Load uploaded workbook (file-like), append a sheet with the AC data, and return bytes.
+    Load uploaded workbook (file-like), append a sheet with the AC data, and return a file-like.
     """
     # load existing
     uploaded_file_stream.seek(0)
@@ -393,11 +368,9 @@ def merge_into_uploaded_workbook_bytes(uploaded_file_stream, period_id: int = No
         period = ACPeriod.query.filter_by(is_active=True).first()
 
     period_name = period.period_name if period else f"AC_{datetime.utcnow().strftime('%Y%m%d')}"
-    rows = _gather_ac_rows(period)
+    rows = _export_rows(period)
     _write_rows_to_sheet(wb, f"AC_{period_name}", rows, period=period)
 
-    out = BytesIO()
-    wb.save(out)
-    out.seek(0)
+    out = _save_workbook(wb)
     filename = f"merged_AC_{period_name}.xlsx"
-    return out, filename
\ No newline at end of file
+    return out, filename
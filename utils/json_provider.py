@@ -0,0 +1,21 @@
+"""
+orjson-backed JSON provider for Flask
+Installed as app.json in create_app(); serves jsonify() and request.get_json()
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Same output rules as Flask's default provider: sorted keys, non-string keys
+# allowed, and datetimes passed to Flask's default (HTTP date) handler
+_ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the encoding and decoding"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
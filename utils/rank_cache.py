@@ -0,0 +1,43 @@
+"""
+Cached list of active system ranks
+Rank mappings change only through the rank-mapping admin page, so the
+rank pickers and rank validation read them from the shared cache
+"""
+
+from sqlalchemy import event
+from database.models import RankMapping
+from utils.cache import cache
+
+# Used when no rank mappings have been configured yet
+DEFAULT_RANKS = (
+    'Aspirant', 'Novice', 'Adept', 'Crusader', 'Paladin',
+    'Exemplar', 'Prospect', 'Commander', 'Marshal', 'General', 'Chief General'
+)
+
+ACTIVE_RANKS_CACHE_KEY = 'active_ranks'
+ACTIVE_RANKS_CACHE_TIMEOUT = 300
+
+
+def get_active_ranks() -> list:
+    """Active mapped system ranks in name order, or DEFAULT_RANKS when none are mapped"""
+    ranks = cache.get(ACTIVE_RANKS_CACHE_KEY)
+    if ranks is None:
+        ranks = [
+            system_rank for (system_rank,) in
+            RankMapping.query.with_entities(RankMapping.system_rank)
+            .filter_by(is_active=True).order_by(RankMapping.system_rank)
+        ] or list(DEFAULT_RANKS)
+        cache.set(ACTIVE_RANKS_CACHE_KEY, ranks, timeout=ACTIVE_RANKS_CACHE_TIMEOUT)
+    return ranks
+
+
+def invalidate_active_ranks():
+    """Drop the cached rank list; call after bulk UPDATE/DELETE on rank_mappings, which skip mapper events"""
+    cache.delete(ACTIVE_RANKS_CACHE_KEY)
+
+
+@event.listens_for(RankMapping, 'after_insert')
+@event.listens_for(RankMapping, 'after_update')
+@event.listens_for(RankMapping, 'after_delete')
+def _invalidate_active_ranks(mapper, connection, target):
+    invalidate_active_ranks()
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 from database.models import db, Member, MemberStats
 from flask import current_app
+from sqlalchemy import func
 
 def capture_member_stats():
     """
@@ -8,15 +9,13 @@ def capture_member_stats():
     Saves to the MemberStats table.
     """
     try:
-        # Get all active members
-        members = Member.query.filter_by(is_active=True).all()
-        total_members = len(members)
-        
-        # Calculate rank distribution
-        rank_counts = {}
-        for member in members:
-            rank = member.current_rank
-            rank_counts[rank] = rank_counts.get(rank, 0) + 1
+        # Rank distribution of active members, counted in SQL
+        rank_counts = dict(
+            db.session.query(Member.current_rank, func.count(Member.id))
+            .filter(Member.is_active == True)
+            .group_by(Member.current_rank)
+        )
+        total_members = sum(rank_counts.values())
             
         # Create snapshot
         stats = MemberStats(
@@ -44,8 +43,10 @@ def get_stats_history(days=30):
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        # Get stats ordered by date
-        history = MemberStats.query.filter(
+        # Snapshots ordered by date, as plain rows rather than ORM objects
+        history = db.session.query(
+            MemberStats.timestamp, MemberStats.total_members, MemberStats.rank_counts
+        ).filter(
             MemberStats.timestamp >= cutoff_date
         ).order_by(MemberStats.timestamp.asc()).all()
         
@@ -0,0 +1,47 @@
+"""
+Background Roblox sync queue
+Runs member → Roblox pushes off the request thread so staff actions return after the DB commit
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from database.models import db, Member
+from utils.roblox_sync import sync_member_to_roblox, add_member_to_roblox, remove_member_from_roblox
+
+# One worker keeps Roblox writes in submission order (a promote queued after
+# an add never overtakes it) and bounds concurrent calls to the Roblox API
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='roblox-sync')
+
+SYNC_OPERATIONS = {
+    'add': add_member_to_roblox,
+    'update': sync_member_to_roblox,
+    'remove': remove_member_from_roblox,
+}
+
+
+def _run_member_sync(app, member_id: int, op: str):
+    """Worker job: re-fetch the member in a fresh app context and push it to Roblox"""
+    with app.app_context():
+        try:
+            member = db.session.get(Member, member_id)
+            if not member:
+                app.logger.warning(f"Roblox {op} sync skipped - member {member_id} no longer exists")
+                return
+            result = SYNC_OPERATIONS[op](member)
+            if result['success']:
+                app.logger.info(f"Roblox {op} sync for {member.discord_username}: {result['message']}")
+            else:
+                app.logger.error(f"Roblox {op} sync failed for {member.discord_username}: {result['message']}")
+        except Exception as e:
+            app.logger.error(f"Unexpected error in Roblox {op} sync for member {member_id}: {e}", exc_info=True)
+
+
+def enqueue_member_sync(member_id: int, op: str):
+    """
+    Queue a Roblox sync ('add', 'update' or 'remove') for a member and return immediately.
+    Results and failures are written to the app log.
+    """
+    if op not in SYNC_OPERATIONS:
+        raise ValueError(f"Unknown Roblox sync operation: {op}")
+    app = current_app._get_current_object()
+    _executor.submit(_run_member_sync, app, member_id, op)